@@ -1,21 +1,137 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, List, Tuple, Union
 
+import orjson
+from anyio import to_thread
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from config import settings
+from db.models import Job
+from search.cache import TTLCache
 from search.search_index import search_jobs
+from search.semantic_cache import SemanticCache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Every handler is async; this limiter only bounds the run_in_threadpool
+    # calls that do the blocking work (database searches, embedding model).
+    # anyio defaults to 40 threads; size it to match the database pool instead
+    to_thread.current_default_thread_limiter().total_tokens = settings.api_threads
+    if settings.semantic_cache_enabled:
+        # Load the embedding model now rather than on the first search
+        from search.vectorizer import get_model
+
+        await run_in_threadpool(get_model)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+_search_cache = TTLCache(maxsize=settings.search_cache_size, ttl=settings.search_cache_ttl)
+_semantic_cache: Union[SemanticCache, None] = (
+    SemanticCache(
+        threshold=settings.semantic_cache_threshold,
+        maxsize=settings.search_cache_size,
+        ttl=settings.semantic_cache_ttl,
+    )
+    if settings.semantic_cache_enabled
+    else None
+)
+
+
+def _cache_key(q: str) -> str:
+    return q.strip().casefold()
+
+
+@lru_cache(maxsize=4096)
+def _embed_query(key: str) -> Tuple[float, ...]:
+    """Embed a normalized query, remembering recent ones so repeats skip the model."""
+    from search.vectorizer import embed
+
+    return tuple(embed(key))
+
+
+# The only fields /search returns; selected as plain rows, not Job objects
+_RESULT_COLUMNS = (Job.title, Job.company, Job.location, Job.url, Job.source)
+_RESULT_FIELDS = tuple(column.key for column in _RESULT_COLUMNS)
+
 
-app = FastAPI()
+def _render(results: Iterable[Tuple]) -> bytes:
+    """Serialize search results once with orjson so cached hits are returned as-is."""
+    return orjson.dumps([dict(zip(_RESULT_FIELDS, row)) for row in results])
+
+
+def _search(q: str) -> bytes:
+    """Run the search for ``q`` on a session of its own and serialize the results."""
+    return _render(search_jobs(q.strip(), columns=_RESULT_COLUMNS))
+
+
+def _cached_search(q: str) -> bytes:
+    """Return serialized results for ``q``, consulting the result caches first."""
+    key = _cache_key(q)
+    body = _search_cache.get(key)
+    if body is None:
+        vector = None
+        if _semantic_cache is not None:
+            vector = _embed_query(key)
+            body = _semantic_cache.get(vector)
+        if body is None:
+            body = _search(q)
+            if vector is not None:
+                _semantic_cache.add(vector, body)
+        _search_cache.set(key, body)
+    return body
 
 
 @app.get("/search")
-def search(q: str):
-    """Return job search results for the given query."""
-    results = search_jobs(q)
-    return [
-        {
-            "title": job.title,
-            "company": job.company,
-            "location": job.location,
-            "url": job.url,
-            "source": job.source,
-        }
-        for job in results
-    ]
+async def search(q: str, nocache: bool = False):
+    """Return job search results for the given query.
+
+    Results are cached per normalized query, and near-duplicate queries share
+    results when the semantic cache is enabled; pass ``nocache=1`` to bypass.
+    Cache hits are answered on the event loop; embedding and database work
+    runs in the threadpool.
+    """
+    if nocache:
+        body = await run_in_threadpool(_search, q)
+    else:
+        body = _search_cache.get(_cache_key(q))
+        if body is None:
+            body = await run_in_threadpool(_cached_search, q)
+    return Response(content=body, media_type="application/json")
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=64)
+
+
+async def _stream_batch(queries: List[str]) -> AsyncIterator[bytes]:
+    # Run each distinct query once and fan its results out to every position
+    positions: Dict[str, List[int]] = {}
+    for index, q in enumerate(queries):
+        positions.setdefault(_cache_key(q), []).append(index)
+
+    async def run(key: str) -> Tuple[str, bytes]:
+        return key, await run_in_threadpool(_cached_search, key)
+
+    for next_done in asyncio.as_completed([run(key) for key in positions]):
+        key, body = await next_done
+        for index in positions[key]:
+            query = orjson.dumps(queries[index])
+            yield b'{"index": %d, "query": %s, "results": %s}\n' % (index, query, body)
+
+
+@app.post("/search/batch")
+async def search_batch(request: BatchSearchRequest):
+    """Run several searches concurrently and stream results as NDJSON.
+
+    Each line carries the ``index`` of the query in the request, since lines
+    are written in completion order rather than request order.
+    """
+    return StreamingResponse(_stream_batch(request.queries), media_type="application/x-ndjson")
@@ -0,0 +1,23 @@
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session: Union[requests.Session, None] = None
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session shared by all job source clients.
+
+    Reusing one session keeps TCP/TLS connections to the job APIs alive
+    between calls instead of reconnecting on every request.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
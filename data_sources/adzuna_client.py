@@ -1,7 +1,8 @@
 from typing import Iterable, Dict, Any, Union
 
-import requests
+import orjson
 
+from ._http import get_session
 from .base import JobSource
 from config import settings
 
@@ -14,6 +15,7 @@ class AdzunaClient(JobSource):
     def __init__(self, app_id: Union[str, None] = None, app_key: Union[str, None] = None) -> None:
         self.app_id = app_id or settings.adzuna_app_id
         self.app_key = app_key or settings.adzuna_app_key
+        self._session = get_session()
 
     def fetch_jobs(
         self,
@@ -37,7 +39,7 @@ class AdzunaClient(JobSource):
             "results_per_page": results_per_page,
             "content-type": "application/json",
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = self._session.get(url, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("results", [])
@@ -1,7 +1,6 @@
 from typing import Iterable, Dict, Any, Union
 
-import requests
-
+from ._http import get_session
 from .base import JobSource
 from config import settings
 
@@ -13,6 +12,7 @@ class IndeedClient(JobSource):
 
     def __init__(self, api_key: Union[str, None] = None) -> None:
         self.api_key = api_key or settings.indeed_api_key
+        self._session = get_session()
 
     def fetch_jobs(self, query: str = "software engineer", location: str = "United States") -> Iterable[Dict[str, Any]]:
         """Return a list of raw job postings.
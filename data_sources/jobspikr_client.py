@@ -1,7 +1,8 @@
 from typing import Iterable, Dict, Any, Union
 
-import requests
+import orjson
 
+from ._http import get_session
 from .base import JobSource
 from config import settings
 
@@ -13,6 +14,7 @@ class JobsPikrClient(JobSource):
 
     def __init__(self, api_key: Union[str, None] = None) -> None:
         self.api_key = api_key or settings.jobspikr_api_key
+        self._session = get_session()
 
     def fetch_jobs(
         self,
@@ -34,7 +36,7 @@ class JobsPikrClient(JobSource):
             "country": location,
             "per_page": results_per_page,
         }
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self._session.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("data", [])
@@ -1,7 +1,8 @@
 from typing import Iterable, Dict, Any, Union
 
-import requests
+import orjson
 
+from ._http import get_session
 from .base import JobSource
 from config import settings
 
@@ -18,6 +19,9 @@ class USAJobsClient(JobSource):
     ) -> None:
         self.api_key = api_key or settings.usajobs_api_key
         self.user_agent = user_agent or settings.usajobs_user_agent
+        self._session = get_session()
+        # Auth headers are fixed per client, so build them once
+        self._headers = {"Authorization-Key": self.api_key, "User-Agent": self.user_agent}
 
     def fetch_jobs(
         self,
@@ -33,13 +37,12 @@ class USAJobsClient(JobSource):
             return []
 
         url = "https://data.usajobs.gov/api/search"
-        headers = {"Authorization-Key": self.api_key, "User-Agent": self.user_agent}
         params = {
             "Keyword": query,
             "LocationName": location,
             "ResultsPerPage": results_per_page,
         }
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self._session.get(url, headers=self._headers, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("SearchResult", {}).get("SearchResultItems", [])
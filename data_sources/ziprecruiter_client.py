@@ -1,7 +1,8 @@
 from typing import Iterable, Dict, Any, Union
 
-import requests
+import orjson
 
+from ._http import get_session
 from .base import JobSource
 from config import settings
 
@@ -13,6 +14,7 @@ class ZipRecruiterClient(JobSource):
 
     def __init__(self, api_key: Union[str, None] = None) -> None:
         self.api_key = api_key or settings.ziprecruiter_api_key
+        self._session = get_session()
 
     def fetch_jobs(
         self,
@@ -34,7 +36,7 @@ class ZipRecruiterClient(JobSource):
             "location": location,
             "jobs_per_page": jobs_per_page,
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = self._session.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return data.get("jobs", [])
@@ -2,46 +2,145 @@
 """
 Enhanced Database Client with Advanced Queries
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional, Generator, Tuple
+from typing import List, Dict, Any, Optional, Generator, Tuple, Set, Callable, FrozenSet
 import logging
+import threading
 
-from sqlalchemy import create_engine, text, and_, or_, func, select
-from sqlalchemy.orm import sessionmaker, Session, scoped_session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, event, text, and_, or_, func, select, update, insert, delete, inspect, bindparam, lambda_stmt, case
+from sqlalchemy.orm import sessionmaker, Session, selectinload
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from config import settings
-from db.models import Base, Job, Skill, JobSkill, User, UserSkill, UserJobInteraction, ScrapingLog
+from db.models import Base, Job, Skill, JobSkill, User, UserSkill, UserJobInteraction, ScrapingLog, EMBEDDING_DIM
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# search.vectorizer pulls in sentence-transformers, so it is imported on first
+# use rather than with this module
+_embed_batch: Optional[Callable[[List[str]], List[Any]]] = None
+
+
+def _get_embed_batch() -> Callable[[List[str]], List[Any]]:
+    global _embed_batch
+    if _embed_batch is None:
+        from search.vectorizer import embed_batch
+        _embed_batch = embed_batch
+    return _embed_batch
+
+
+def dialect_insert_for(engine: Engine):
+    """Return ``engine``'s dialect ``insert`` supporting ON CONFLICT, or ``None``."""
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+# Full-text predicate and ranking over the weighted ``search_tsv`` column
+# added by db/migrate.py, shared by every search entry point so a query
+# matches the same jobs whichever one it goes through; ``:query`` is bound
+# at execute time
+FULL_TEXT_MATCH = text("jobs.search_tsv @@ plainto_tsquery('english', :query)")
+FULL_TEXT_RANK = text("ts_rank_cd(jobs.search_tsv, plainto_tsquery('english', :query)) DESC")
+
+
+def convert_embedding_columns(conn) -> List[str]:
+    """Convert embedding columns from older versions to halfvec, in place.
+
+    Embeddings are mapped as halfvec (float16) on PostgreSQL, while databases
+    created by earlier versions hold JSON arrays or float32 vectors. This has
+    to run before anything reads or writes embeddings through the ORM, since
+    the halfvec bind/result processors assume the new column type. The old
+    ivfflat index is dropped with the jobs column, as its operator class only
+    applies to vector columns. Returns the converted ``table.column`` names.
+    """
+    if conn.dialect.name != 'postgresql':
+        return []
+    converted = []
+    for table, column in (("jobs", "embedding"), ("users", "profile_embedding")):
+        column_type = conn.execute(text("""
+                                        SELECT udt_name FROM information_schema.columns
+                                        WHERE table_name = :table AND column_name = :column
+                                        """), {"table": table, "column": column}).scalar()
+        if column_type is not None and column_type != "halfvec":
+            if table == "jobs":
+                conn.execute(text("DROP INDEX IF EXISTS idx_job_embedding"))
+            conn.execute(text(f"""
+                              ALTER TABLE {table} ALTER COLUMN {column}
+                                  TYPE halfvec({EMBEDDING_DIM}) USING {column}::text::halfvec
+                              """))
+            converted.append(f"{table}.{column}")
+    return converted
+
+
+def _pool_options(db_url: str) -> Dict[str, Any]:
+    """Connection pool arguments for ``create_engine`` suited to ``db_url``."""
+    url = make_url(db_url)
+    if url.get_backend_name() == 'sqlite':
+        # Sessions are used from worker threads (pipeline fetches, the embedding
+        # worker, API threadpool), so connections must not be thread-bound. An
+        # in-memory database only exists on its one connection, so share it
+        options: Dict[str, Any] = {'connect_args': {'check_same_thread': False}}
+        if url.database in (None, '', ':memory:'):
+            options['poolclass'] = StaticPool
+        return options
+
+    # Configure connection pool (sized via JOB_FINDER_DB_POOL_* settings)
+    return {
+        'poolclass': QueuePool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_recycle': settings.db_pool_recycle,
+        'pool_timeout': settings.db_pool_timeout,
+        'pool_pre_ping': True,  # Verify connections before using
+    }
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Trade per-commit fsyncs for WAL journaling on local SQLite databases."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 
 class DatabaseClient:
     """Enhanced database client with connection pooling and advanced queries."""
 
+    # Rows per upsert statement; keeps bind parameter counts well under the
+    # driver limits (65535 for Postgres) on large pipeline runs
+    UPSERT_CHUNK_SIZE = 5000
+
     def __init__(self, db_url: str = None):
         """Initialize database client with connection pooling."""
         self.db_url = db_url or settings.db_url
 
-        # Configure connection pool
-        pool_size = 10 if 'postgresql' in self.db_url else 5
-
-        self.engine = create_engine(
-            self.db_url,
-            echo=False,
-            poolclass=QueuePool,
-            pool_size=pool_size,
-            max_overflow=20,
-            pool_pre_ping=True,  # Verify connections before using
-            future=True
-        )
+        self.engine = create_engine(self.db_url, echo=False, future=True, **_pool_options(self.db_url))
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _sqlite_pragmas)
+
+        # Plain session factory: every caller gets its own session rather
+        # than a per-thread one
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
 
-        # Create session factory with scoping for thread safety
-        session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
-        self.SessionLocal = scoped_session(session_factory)
+        # Single worker that computes job embeddings off the upsert path;
+        # pending work is finished before the interpreter exits
+        self._embedder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-embed")
+
+        # Resolved on first search; see has_full_text_index
+        self._full_text: Optional[bool] = None
 
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
@@ -57,9 +156,21 @@ class DatabaseClient:
         finally:
             session.close()
 
+    def has_full_text_index(self) -> bool:
+        """Whether jobs has the ``search_tsv`` column added by ``db/migrate.py``."""
+        if self._full_text is None:
+            self._full_text = (
+                self.engine.dialect.name == 'postgresql'
+                and 'search_tsv' in {c['name'] for c in inspect(self.engine).get_columns('jobs')}
+            )
+        return self._full_text
+
     def init_db(self) -> None:
         """Create database tables if they don't exist."""
         Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as conn:
+            for column in convert_embedding_columns(conn):
+                logger.warning(f"Converted {column} to halfvec; run db/migrate.py to rebuild its index")
         logger.info("Database initialized")
 
     def drop_all_tables(self) -> None:
@@ -97,20 +208,103 @@ class DatabaseClient:
 
             # Handle skills
             if skills_data:
-                self._update_job_skills(session, job, skills_data)
+                touched = self._update_job_skills(session, job.id, skills_data)
+                self._refresh_skill_counts(session, touched)
 
-            # Generate embedding if description exists and not already set
-            if job.description and not job.embedding:
-                try:
-                    from search.vectorizer import embed
-                    job.embedding = embed(f"{job.title} {job.description[:1000]}")
-                except Exception as e:
-                    logger.warning(f"Could not generate embedding: {e}")
+        # Embed once the row is committed, without holding up the caller
+        self.embed_jobs_in_background([job.id])
+        return job
 
-            return job
+    def _insert(self):
+        """Return the dialect-specific ``insert`` construct that supports ON CONFLICT."""
+        return dialect_insert_for(self.engine)
 
     def batch_upsert_jobs(self, jobs_data: List[Dict[str, Any]]) -> Tuple[int, int]:
-        """Batch insert/update jobs for better performance."""
+        """Batch insert/update jobs keyed on URL, one statement per set of supplied columns."""
+        dialect_insert = self._insert()
+        if dialect_insert is None:
+            return self._batch_upsert_jobs_rowwise(jobs_data)
+
+        # Later rows win when the same URL appears twice in one batch, since
+        # ON CONFLICT cannot update the same row twice in one statement
+        rows_by_url: Dict[Any, Dict[str, Any]] = {}
+        rows_without_url = []
+        for job_data in jobs_data:
+            row = {k: v for k, v in job_data.items() if hasattr(Job, k)}
+            if row.get('url'):
+                rows_by_url[row['url']] = row
+            else:
+                # Sources send "" for a missing URL; store NULL instead, which
+                # never conflicts on the unique index, so each such job is
+                # inserted rather than overwriting the previous one
+                if 'url' in row:
+                    row['url'] = None
+                rows_without_url.append(row)
+        rows = list(rows_by_url.values()) + rows_without_url
+        if not rows:
+            return 0, 0
+
+        # executemany needs every row to carry the same keys, and ON CONFLICT
+        # must only overwrite the columns a row actually supplied, so rows
+        # are upserted in groups that share one key set
+        groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            columns = frozenset(k for k in row if k != 'skills')
+            groups.setdefault(columns, []).append(row)
+
+        # All chunks share one transaction, so a failed run leaves no partial batch
+        chunk = self.UPSERT_CHUNK_SIZE
+        job_ids: List[int] = []
+        with self.get_session() as session:
+            existing = self._existing_urls(session, list(rows_by_url))
+            touched_skills: Set[int] = set()
+            for columns, group in groups.items():
+                stmt = dialect_insert(Job)
+                update_columns = {c: stmt.excluded[c] for c in columns if c != 'url'}
+                update_columns['updated_at'] = func.now()
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Job.url],
+                    set_=update_columns
+                ).returning(Job.id, sort_by_parameter_order=True)
+                params = [{c: row[c] for c in columns} for row in group]
+
+                for start in range(0, len(params), chunk):
+                    chunk_ids = session.scalars(stmt, params[start:start + chunk]).all()
+                    job_ids.extend(chunk_ids)
+                    touched_skills |= self._replace_job_skills(session, {
+                        job_id: row['skills']
+                        for job_id, row in zip(chunk_ids, group[start:start + chunk])
+                        if row.get('skills')
+                    })
+            self._refresh_skill_counts(session, touched_skills)
+
+        self.embed_jobs_in_background(job_ids)
+
+        # Every written row returned its id; the ones whose URL was already
+        # stored were updates
+        updated = len(existing)
+        inserted = len(set(job_ids)) - updated
+        logger.info(f"Batch upsert complete: {inserted} inserted, {updated} updated")
+        return inserted, updated
+
+    def existing_urls(self, urls: List[str]) -> Set[str]:
+        """Return the subset of ``urls`` already stored as jobs."""
+        with self.get_session() as session:
+            return self._existing_urls(session, urls)
+
+    def _existing_urls(self, session: Session, urls: List[str]) -> Set[str]:
+        # Only the candidates are sent and only the matches come back, via
+        # the unique url index, in chunks that stay under bind limits
+        chunk = self.UPSERT_CHUNK_SIZE
+        existing: Set[str] = set()
+        for start in range(0, len(urls), chunk):
+            existing.update(session.scalars(
+                select(Job.url).where(Job.url.in_(urls[start:start + chunk]))
+            ))
+        return existing
+
+    def _batch_upsert_jobs_rowwise(self, jobs_data: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert jobs one at a time, for dialects without ON CONFLICT support."""
         inserted = 0
         updated = 0
 
@@ -137,40 +331,119 @@ class DatabaseClient:
         logger.info(f"Batch upsert complete: {inserted} inserted, {updated} updated")
         return inserted, updated
 
-    def _update_job_skills(self, session: Session, job: Job, skills_list: List[str]) -> None:
-        """Update skills for a job."""
-        # Clear existing skills
-        session.query(JobSkill).filter_by(job_id=job.id).delete()
+    def embed_jobs_in_background(self, job_ids: List[int]) -> Optional[Future]:
+        """Queue embedding generation for committed jobs on the embedding worker."""
+        if not job_ids:
+            return None
+        return self._embedder.submit(self._embed_jobs, list(job_ids))
 
-        for skill_name in skills_list:
-            # Find or create skill
-            skill = session.query(Skill).filter_by(name=skill_name).first()
-            if not skill:
-                skill = Skill(name=skill_name)
-                session.add(skill)
-                session.flush()
-
-            # Create job-skill relationship
-            job_skill = JobSkill(
-                job_id=job.id,
-                skill_id=skill.id,
-                is_required=True
+    def _embed_jobs(self, job_ids: List[int]) -> None:
+        with self.get_session() as session:
+            self._fill_missing_embeddings(session, job_ids)
+
+    def _fill_missing_embeddings(self, session: Session, job_ids: List[int]) -> None:
+        """Generate embeddings for the given jobs that have a description but no vector."""
+        if not job_ids:
+            return
+        missing = session.execute(
+            select(Job.id, Job.title, Job.description).where(
+                Job.id.in_(job_ids),
+                Job.description.isnot(None),
+                Job.description != '',
+                Job.embedding.is_(None)
+            )
+        ).all()
+        if not missing:
+            return
+        try:
+            vectors = _get_embed_batch()([
+                f"{title} {description[:1000]}" for _, title, description in missing
+            ])
+        except Exception as e:
+            logger.warning(f"Could not generate embeddings: {e}")
+            return
+        # ORM bulk UPDATE by primary key, executed as one executemany
+        session.execute(
+            update(Job),
+            [{'id': job_id, 'embedding': vector} for (job_id, _, _), vector in zip(missing, vectors)]
+        )
+
+    def _update_job_skills(self, session: Session, job_id: int, skills_list: List[str]) -> Set[int]:
+        """Update skills for a job and return the ids of every skill whose count changed."""
+        return self._replace_job_skills(session, {job_id: skills_list})
+
+    def _replace_job_skills(self, session: Session, skills_by_job: Dict[int, List[str]]) -> Set[int]:
+        """Replace the skills of several jobs with a fixed number of statements.
+
+        Returns the ids of every skill whose count changed.
+        """
+        job_ids = list(skills_by_job)
+        if not job_ids:
+            return set()
+
+        # Clear existing skills
+        touched = set(session.scalars(select(JobSkill.skill_id).where(JobSkill.job_id.in_(job_ids))))
+        session.execute(delete(JobSkill).where(JobSkill.job_id.in_(job_ids)))
+
+        skill_ids = self._ensure_skills(session, [name for names in skills_by_job.values() for name in names])
+        links = [
+            {'job_id': job_id, 'skill_id': skill_ids[name], 'is_required': True}
+            for job_id, names in skills_by_job.items()
+            for name in dict.fromkeys(n for n in names if n)
+        ]
+        if links:
+            # Core executemany, batched into multi-row INSERTs by insertmanyvalues
+            session.execute(insert(JobSkill), links)
+            touched.update(link['skill_id'] for link in links)
+
+        return touched
+
+    def _ensure_skills(self, session: Session, names: List[str]) -> Dict[str, int]:
+        """Create any missing skills and return a ``name -> id`` map for ``names``."""
+        names = list(dict.fromkeys(n for n in names if n))
+        if not names:
+            return {}
+
+        dialect_insert = self._insert()
+        if dialect_insert is not None:
+            session.execute(
+                dialect_insert(Skill)
+                .values([{'name': name} for name in names])
+                .on_conflict_do_nothing(index_elements=[Skill.name])
             )
-            session.add(job_skill)
 
-            # Update skill job count
-            skill.job_count = session.query(JobSkill).filter_by(skill_id=skill.id).count()
+        skill_ids = dict(session.execute(
+            select(Skill.name, Skill.id).where(Skill.name.in_(names))
+        ).all())
+
+        missing = [name for name in names if name not in skill_ids]
+        if missing:
+            new_skills = [Skill(name=name) for name in missing]
+            session.add_all(new_skills)
+            session.flush()
+            skill_ids.update((skill.name, skill.id) for skill in new_skills)
+        return skill_ids
+
+    def _refresh_skill_counts(self, session: Session, skill_ids: Set[int]) -> None:
+        """Recompute ``Skill.job_count`` for the given skills in one statement."""
+        if not skill_ids:
+            return
+        session.flush()
+        job_count = select(func.count()).where(JobSkill.skill_id == Skill.id).scalar_subquery()
+        session.execute(
+            update(Skill).where(Skill.id.in_(skill_ids)).values(job_count=job_count)
+        )
 
     def get_job_by_id(self, job_id: int) -> Optional[Job]:
         """Get a job by ID with skills loaded."""
         with self.get_session() as session:
-            return session.query(Job).filter_by(id=job_id).first()
+            return session.query(Job).options(selectinload(Job.skills)).filter_by(id=job_id).first()
 
     def get_recent_jobs(self, days: int = 7, limit: int = 100) -> List[Job]:
         """Get jobs posted in the last N days."""
         with self.get_session() as session:
             cutoff_date = date.today() - timedelta(days=days)
-            return session.query(Job).filter(
+            return session.query(Job).options(selectinload(Job.skills)).filter(
                 Job.posting_date >= cutoff_date
             ).order_by(
                 Job.posting_date.desc()
@@ -187,63 +460,83 @@ class DatabaseClient:
             limit: int = 50,
             offset: int = 0
     ) -> List[Job]:
-        """Advanced job search with multiple filters."""
-        with self.get_session() as session:
-            q = session.query(Job)
-
-            # Text search
-            if query:
-                search_filter = or_(
-                    Job.title.ilike(f"%{query}%"),
-                    Job.description.ilike(f"%{query}%"),
-                    Job.company.ilike(f"%{query}%")
-                )
-                q = q.filter(search_filter)
-
-            # Location filter
-            if location:
-                q = q.filter(Job.location.ilike(f"%{location}%"))
-
-            # Company filter
-            if company:
-                q = q.filter(Job.company.ilike(f"%{company}%"))
-
-            # Skills filter (jobs that have ALL specified skills)
-            if skills:
-                for skill_name in skills:
-                    skill_subq = session.query(JobSkill.job_id).join(Skill).filter(
-                        Skill.name.ilike(f"%{skill_name}%")
-                    ).subquery()
-                    q = q.filter(Job.id.in_(select(skill_subq)))
+        """Advanced job search with multiple filters.
+
+        The statement is built as a ``lambda_stmt`` with every filter value
+        passed as a bound parameter, so SQLAlchemy compiles each combination
+        of filters once and reuses the cached SQL on later calls.
+        """
+        stmt = lambda_stmt(lambda: select(Job).options(selectinload(Job.skills)))
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+
+        # Text search: use the GIN-indexed tsvector when the migration has
+        # added it, since leading-wildcard ILIKE forces a sequential scan
+        if query and self.has_full_text_index():
+            stmt += lambda s: s.where(FULL_TEXT_MATCH).order_by(FULL_TEXT_RANK)
+            params["query"] = query
+        elif query:
+            stmt += lambda s: s.where(or_(
+                Job.title.ilike(bindparam("query")),
+                Job.description.ilike(bindparam("query")),
+                Job.company.ilike(bindparam("query"))
+            ))
+            params["query"] = f"%{query}%"
+
+        # Location filter
+        if location:
+            stmt += lambda s: s.where(Job.location.ilike(bindparam("location")))
+            params["location"] = f"%{location}%"
+
+        # Company filter
+        if company:
+            stmt += lambda s: s.where(Job.company.ilike(bindparam("company")))
+            params["company"] = f"%{company}%"
+
+        # Skills filter (jobs that have ALL specified skills), as one join
+        # grouped per job rather than a subquery per skill
+        if skills:
+            wanted = sorted({skill_name.lower() for skill_name in skills})
+            stmt += lambda s: s.join(JobSkill, JobSkill.job_id == Job.id).join(
+                Skill, Skill.id == JobSkill.skill_id
+            ).where(
+                func.lower(Skill.name).in_(bindparam("skills", expanding=True))
+            ).group_by(Job.id).having(
+                func.count(func.distinct(func.lower(Skill.name))) == bindparam("skill_count")
+            )
+            params["skills"] = wanted
+            params["skill_count"] = len(wanted)
 
-            # Source filter
-            if source:
-                q = q.filter(Job.source == source)
+        # Source filter
+        if source:
+            stmt += lambda s: s.where(Job.source == bindparam("source"))
+            params["source"] = source
 
-            # Date filter
-            if days_old:
-                cutoff_date = date.today() - timedelta(days=days_old)
-                q = q.filter(Job.posting_date >= cutoff_date)
+        # Date filter
+        if days_old:
+            stmt += lambda s: s.where(Job.posting_date >= bindparam("cutoff_date"))
+            params["cutoff_date"] = date.today() - timedelta(days=days_old)
 
-            # Order by relevance/date and paginate
-            jobs = q.order_by(
-                Job.posting_date.desc(),
-                Job.relevance_score.desc()
-            ).offset(offset).limit(limit).all()
+        # Order by date/relevance (after text rank, if any) and paginate
+        stmt += lambda s: s.order_by(
+            Job.posting_date.desc(),
+            Job.relevance_score.desc()
+        ).offset(bindparam("offset")).limit(bindparam("limit"))
 
-            return jobs
+        with self.get_session() as session:
+            return session.execute(stmt, params).scalars().all()
 
     # ========== Skill Operations ==========
 
     def get_top_skills(self, limit: int = 20) -> List[Tuple[str, int]]:
         """Get most in-demand skills by job count."""
+        # job_count is kept current by _refresh_skill_counts, so this is a
+        # short scan of idx_skill_job_count_name rather than a join/GROUP BY
         with self.get_session() as session:
-            results = session.query(
-                Skill.name,
-                Skill.job_count
-            ).order_by(
-                Skill.job_count.desc()
-            ).limit(limit).all()
+            results = session.execute(
+                select(Skill.name, Skill.job_count)
+                .order_by(Skill.job_count.desc())
+                .limit(limit)
+            ).all()
 
             return [(name, count) for name, count in results]
 
@@ -257,16 +550,20 @@ class DatabaseClient:
             # Get job count by date
             cutoff_date = date.today() - timedelta(days=days)
 
+            # posting_date is already a DATE, so group on the bare column
+            # (wrapping it in date() would keep its index from being used)
             daily_counts = session.query(
-                func.date(Job.posting_date).label('date'),
+                Job.posting_date,
                 func.count(Job.id).label('count')
             ).join(
-                JobSkill
+                JobSkill, JobSkill.job_id == Job.id
             ).filter(
                 JobSkill.skill_id == skill.id,
                 Job.posting_date >= cutoff_date
             ).group_by(
-                func.date(Job.posting_date)
+                Job.posting_date
+            ).order_by(
+                Job.posting_date
             ).all()
 
             return {
@@ -298,22 +595,23 @@ class DatabaseClient:
             # Clear existing skills
             session.query(UserSkill).filter_by(user_id=user_id).delete()
 
+            skill_ids = self._ensure_skills(
+                session, [skill_data.get('name') for skill_data in skills]
+            )
+            # Keyed by skill id so a repeated skill keeps its last entry
+            rows = {}
             for skill_data in skills:
-                skill_name = skill_data.get('name')
-                skill = session.query(Skill).filter_by(name=skill_name).first()
-
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    session.add(skill)
-                    session.flush()
-
-                user_skill = UserSkill(
-                    user_id=user_id,
-                    skill_id=skill.id,
-                    proficiency_level=skill_data.get('proficiency_level'),
-                    years_experience=skill_data.get('years_experience')
-                )
-                session.add(user_skill)
+                skill_id = skill_ids.get(skill_data.get('name'))
+                if skill_id is None:
+                    continue
+                rows[skill_id] = {
+                    'user_id': user_id,
+                    'skill_id': skill_id,
+                    'proficiency_level': skill_data.get('proficiency_level'),
+                    'years_experience': skill_data.get('years_experience')
+                }
+            if rows:
+                session.execute(insert(UserSkill), list(rows.values()))
 
     def save_job_for_user(self, user_id: int, job_id: int) -> None:
         """Save a job to user's saved list."""
@@ -352,34 +650,35 @@ class DatabaseClient:
         with self.get_session() as session:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-            logs = session.query(ScrapingLog).filter(
-                ScrapingLog.started_at >= cutoff_date
+            # Aggregate per source in the database instead of loading every log
+            rows = session.execute(
+                select(
+                    ScrapingLog.source,
+                    func.count().label('runs'),
+                    func.sum(case((ScrapingLog.status == 'completed', 1), else_=0)).label('ok'),
+                    func.sum(case((ScrapingLog.status == 'failed', 1), else_=0)).label('failed'),
+                    func.coalesce(func.sum(ScrapingLog.jobs_fetched), 0).label('fetched'),
+                    func.coalesce(func.sum(ScrapingLog.jobs_inserted), 0).label('inserted')
+                ).where(
+                    ScrapingLog.started_at >= cutoff_date
+                ).group_by(ScrapingLog.source)
             ).all()
 
-            stats = {
-                'total_runs': len(logs),
-                'successful_runs': len([l for l in logs if l.status == 'completed']),
-                'failed_runs': len([l for l in logs if l.status == 'failed']),
-                'total_jobs_fetched': sum(l.jobs_fetched for l in logs),
-                'total_jobs_inserted': sum(l.jobs_inserted for l in logs),
-                'by_source': {}
-            }
-
-            # Group by source
-            for log in logs:
-                source = log.source
-                if source not in stats['by_source']:
-                    stats['by_source'][source] = {
-                        'runs': 0,
-                        'jobs_fetched': 0,
-                        'jobs_inserted': 0
+            return {
+                'total_runs': sum(row.runs for row in rows),
+                'successful_runs': sum(row.ok for row in rows),
+                'failed_runs': sum(row.failed for row in rows),
+                'total_jobs_fetched': sum(row.fetched for row in rows),
+                'total_jobs_inserted': sum(row.inserted for row in rows),
+                'by_source': {
+                    row.source: {
+                        'runs': row.runs,
+                        'jobs_fetched': row.fetched,
+                        'jobs_inserted': row.inserted
                     }
-
-                stats['by_source'][source]['runs'] += 1
-                stats['by_source'][source]['jobs_fetched'] += log.jobs_fetched
-                stats['by_source'][source]['jobs_inserted'] += log.jobs_inserted
-
-            return stats
+                    for row in rows
+                }
+            }
 
     def log_scraping_run(
             self,
@@ -388,37 +687,62 @@ class DatabaseClient:
             jobs_inserted: int = 0,
             jobs_updated: int = 0,
             status: str = 'completed',
-            error_message: Optional[str] = None
+            error_message: Optional[str] = None,
+            started_at: Optional[datetime] = None
     ) -> None:
         """Log a scraping run for monitoring."""
-        with self.get_session() as session:
-            log = ScrapingLog(
-                source=source,
-                jobs_fetched=jobs_fetched,
-                jobs_inserted=jobs_inserted,
-                jobs_updated=jobs_updated,
-                status=status,
-                error_message=error_message,
-                completed_at=datetime.utcnow() if status in ['completed', 'failed'] else None
-            )
-
-            if log.completed_at:
-                log.duration_seconds = (
-                        log.completed_at - log.started_at
-                ).total_seconds()
+        self.log_scraping_runs([{
+            'source': source,
+            'jobs_fetched': jobs_fetched,
+            'jobs_inserted': jobs_inserted,
+            'jobs_updated': jobs_updated,
+            'status': status,
+            'error_message': error_message,
+            'started_at': started_at,
+        }])
+
+    def log_scraping_runs(self, runs: List[Dict[str, Any]]) -> None:
+        """Log several scraping runs with one INSERT.
+
+        Each run takes the keyword arguments of ``log_scraping_run``.
+        """
+        if not runs:
+            return
+
+        now = datetime.utcnow()
+        rows = []
+        for run in runs:
+            started_at = run.get('started_at') or now
+            completed_at = now if run.get('status', 'completed') in ['completed', 'failed'] else None
+            rows.append({
+                'source': run['source'],
+                'jobs_fetched': run.get('jobs_fetched', 0),
+                'jobs_inserted': run.get('jobs_inserted', 0),
+                'jobs_updated': run.get('jobs_updated', 0),
+                'status': run.get('status', 'completed'),
+                'error_message': run.get('error_message'),
+                'started_at': started_at,
+                'completed_at': completed_at,
+                'duration_seconds': (completed_at - started_at).total_seconds() if completed_at else None,
+            })
 
-            session.add(log)
+        with self.get_session() as session:
+            session.execute(insert(ScrapingLog), rows)
 
 
 # Create a singleton instance
 _db_client = None
+_db_client_lock = threading.Lock()
 
 
 def get_db_client() -> DatabaseClient:
     """Get or create the database client singleton."""
     global _db_client
     if _db_client is None:
-        _db_client = DatabaseClient()
+        # API threads can race on the first request; build only one engine
+        with _db_client_lock:
+            if _db_client is None:
+                _db_client = DatabaseClient()
     return _db_client
 
 
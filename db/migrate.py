@@ -7,28 +7,45 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+import csv
+import io
 import json
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, text, inspect, select, update, func, exists
+from sqlalchemy.orm import sessionmaker, Session, undefer
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 
 from config import settings
+from db.db_client import convert_embedding_columns, dialect_insert_for
 from db.models import Base, Job, Skill, JobSkill, User, ScrapingLog
-from parsers.skills_extractor import SKILLS_TAXONOMY
-from search.vectorizer import embed
+from parsers.skills_extractor import SKILLS_TAXONOMY_FLAT
+from search.cache import TTLCache, text_digest
 
 
 class DatabaseMigrator:
     """Handle database migrations and setup."""
 
-    def __init__(self, db_url: str = None):
-        """Initialize the migrator with database connection."""
+    # Jobs fetched and committed together while migrating job skills
+    JOB_CHUNK_SIZE = 1000
+
+    def __init__(self, db_url: str = None, workers: Optional[int] = None):
+        """Initialize the migrator with database connection.
+
+        ``workers`` is the number of processes used for skill extraction
+        (defaults to the CPU count; 1 extracts in this process).
+        """
         self.db_url = db_url or settings.db_url
-        self.engine = create_engine(self.db_url, echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.workers = workers
+        # One-shot script: don't keep idle pooled connections around afterwards
+        self.engine = create_engine(self.db_url, echo=False, poolclass=NullPool)
+        # Chunked commits below shouldn't expire and re-select loaded objects
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False, autoflush=False)
         self.inspector = inspect(self.engine)
+        # Skills extracted per job text, so duplicated postings are parsed once
+        self._skills_by_text = TTLCache(maxsize=16_384, ttl=None)
 
     def setup_extensions(self) -> bool:
         """Setup PostgreSQL extensions (pgvector for semantic search)."""
@@ -56,96 +73,258 @@ class DatabaseMigrator:
             print(f"✗ Error setting up extensions: {e}")
             return False
 
-    def create_skills_table(self, session: Session) -> Dict[str, Skill]:
-        """Create and populate the skills table from taxonomy."""
+    def create_skills_table(self, session: Session) -> Dict[str, int]:
+        """Create and populate the skills table from taxonomy; return a lowercase ``name -> id`` map."""
         print("Creating skills table...")
 
-        skill_map = {}
-
-        for category, skills_list in SKILLS_TAXONOMY.items():
-            for skill_name in skills_list:
-                # Check if skill already exists
-                existing_skill = session.query(Skill).filter_by(name=skill_name).first()
-
-                if not existing_skill:
-                    skill = Skill(
-                        name=skill_name,
-                        category=category,
-                        job_count=0
-                    )
-                    session.add(skill)
-                    skill_map[skill_name.lower()] = skill
-                else:
-                    skill_map[skill_name.lower()] = existing_skill
+        # First category wins for names listed more than once
+        rows: Dict[str, Dict[str, Any]] = {}
+        for category, skill_name, _ in SKILLS_TAXONOMY_FLAT:
+            rows.setdefault(skill_name, {"name": skill_name, "category": category, "job_count": 0})
+
+        # One bulk load that leaves already-present skills untouched
+        dialect_insert = dialect_insert_for(self.engine)
+        if self._can_copy() and rows:
+            self._copy_rows(
+                session, "skills", ("name", "category", "job_count"),
+                [(row["name"], row["category"], row["job_count"]) for row in rows.values()]
+            )
+        elif dialect_insert is not None and rows:
+            session.execute(
+                dialect_insert(Skill).on_conflict_do_nothing(index_elements=[Skill.name]),
+                list(rows.values())
+            )
+        else:
+            existing = set(session.scalars(select(Skill.name).where(Skill.name.in_(rows))))
+            session.add_all(Skill(**row) for name, row in rows.items() if name not in existing)
 
         session.commit()
+
+        # Plain ``name -> id`` pairs; the migration never needs Skill objects
+        skill_map = {
+            name.lower(): skill_id
+            for name, skill_id in session.execute(
+                select(Skill.name, Skill.id).where(Skill.name.in_(rows))
+            )
+        }
         print(f"✓ Created/verified {len(skill_map)} skills")
         return skill_map
 
-    def migrate_job_skills(self, session: Session, skill_map: Dict[str, Skill]) -> int:
+    def migrate_job_skills(self, session: Session, skill_map: Dict[str, int]) -> int:
         """Migrate skills from JSON field to many-to-many relationship."""
         print("Migrating job skills...")
 
-        jobs = session.query(Job).all()
         migrated_count = 0
+        touched_skill_ids: Set[int] = set()
+        last_id = 0
+
+        # Skill extraction is CPU-bound Python, so it is spread over worker
+        # processes; embedding (already multithreaded) and every database call
+        # stay in this process
+        workers = self.workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        try:
+            if executor is not None:
+                # Start the workers now: forked children then don't inherit
+                # the torch runtime loaded below, and spawned ones only import
+                # what extraction needs (search.vectorizer is imported lazily)
+                executor.submit(int).result()
+
+            # Load the embedding model before the first chunk needs it
+            try:
+                from search.vectorizer import get_model
+                get_model()
+            except Exception as e:
+                print(f"Warning: Could not load embedding model: {e}")
+
+            # Walk jobs in id order one chunk at a time, committing each chunk
+            # so neither the session nor the transaction grows with the table
+            while True:
+                # Jobs that already have skills in the new structure are skipped
+                # by the anti-join, so no id set is pulled into Python
+                pending = session.scalars(
+                    select(Job)
+                    .options(undefer(Job.embedding))
+                    .where(Job.id > last_id, ~exists().where(JobSkill.job_id == Job.id))
+                    .order_by(Job.id)
+                    .limit(self.JOB_CHUNK_SIZE)
+                ).all()
+                if not pending:
+                    break
+                last_id = pending[-1].id
+
+                self._extract_chunk_skills(pending, executor)
+                migrated, touched = self._migrate_job_chunk(session, pending, skill_map)
+                migrated_count += migrated
+                touched_skill_ids |= touched
+
+                session.commit()
+                session.expunge_all()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # Recount the affected skills in a single UPDATE
+        if touched_skill_ids:
+            job_count = select(func.count()).where(JobSkill.skill_id == Skill.id).scalar_subquery()
+            session.execute(
+                update(Skill).where(Skill.id.in_(touched_skill_ids)).values(job_count=job_count)
+            )
+            session.commit()
+
+        print(f"✓ Migrated skills for {migrated_count} jobs")
+        return migrated_count
+
+    def _extract_chunk_skills(self, jobs: List[Job], executor: Optional[ProcessPoolExecutor]) -> None:
+        """Extract skills for every distinct, not yet memoized job text in ``jobs``."""
+        from parsers.skills_extractor import extract_skills
 
+        texts: Dict[bytes, str] = {}
         for job in jobs:
-            # Check if job already has skills in the new structure
-            if job.skills:
+            if hasattr(job, '_skills_json'):
                 continue
+            text = f"{job.title} {job.description or ''}"
+            key = text_digest(text)
+            if key not in texts and self._skills_by_text.get(key) is None:
+                texts[key] = text
+        if not texts:
+            return
+
+        if executor is not None:
+            results = executor.map(extract_skills, texts.values(), chunksize=32)
+        else:
+            results = map(extract_skills, texts.values())
+        for key, skills in zip(texts, results):
+            self._skills_by_text.set(key, skills)
+
+    def _migrate_job_chunk(
+        self, session: Session, jobs: List[Job], skill_map: Dict[str, int]
+    ) -> Tuple[int, Set[int]]:
+        """Link one chunk of jobs to their skills; return (jobs migrated, skill ids linked)."""
+        from parsers.skills_extractor import extract_skills
+
+        job_skill_names: List[Tuple[int, List[str]]] = []
+        new_skill_names: Dict[str, str] = {}
+        pending_embeddings: List[Job] = []
 
+        for job in jobs:
             # Get skills from the old JSON field if it exists
             if hasattr(job, '_skills_json'):
                 old_skills = job._skills_json
             else:
                 # Try to get from description using skill extractor
-                from parsers.skills_extractor import extract_skills
                 text = f"{job.title} {job.description or ''}"
-                old_skills = extract_skills(text)
+                key = text_digest(text)
+                old_skills = self._skills_by_text.get(key)
+                if old_skills is None:
+                    old_skills = extract_skills(text)
+                    self._skills_by_text.set(key, old_skills)
 
             if old_skills:
+                job_skill_names.append((job.id, old_skills))
                 for skill_name in old_skills:
-                    skill_lower = skill_name.lower()
-
-                    # Find or create skill
-                    if skill_lower in skill_map:
-                        skill = skill_map[skill_lower]
-                    else:
-                        # Create new skill if not in taxonomy
-                        skill = Skill(name=skill_name, category="other")
-                        session.add(skill)
-                        session.flush()
-                        skill_map[skill_lower] = skill
-
-                    # Create job-skill relationship
-                    job_skill = session.query(JobSkill).filter_by(
-                        job_id=job.id,
-                        skill_id=skill.id
-                    ).first()
-
-                    if not job_skill:
-                        job_skill = JobSkill(
-                            job_id=job.id,
-                            skill_id=skill.id,
-                            is_required=True
-                        )
-                        session.add(job_skill)
-
-                        # Update skill job count
-                        skill.job_count += 1
-
-                migrated_count += 1
-
-                # Generate embedding for semantic search
-                if job.description and not job.embedding:
-                    try:
-                        job.embedding = embed(f"{job.title} {job.description[:1000]}")
-                    except Exception as e:
-                        print(f"Warning: Could not generate embedding for job {job.id}: {e}")
+                    if skill_name.lower() not in skill_map:
+                        new_skill_names.setdefault(skill_name.lower(), skill_name)
+
+                # Queue the job for this chunk's embedding pass
+                if job.description and job.embedding is None:
+                    pending_embeddings.append(job)
+
+        # Generate embeddings for semantic search, one model call per chunk
+        if pending_embeddings:
+            try:
+                from search.vectorizer import embed_batch
+                vectors = embed_batch([
+                    f"{job.title} {job.description[:1000]}" for job in pending_embeddings
+                ])
+            except Exception as e:
+                print(f"Warning: Could not generate embeddings for {len(pending_embeddings)} jobs: {e}")
+            else:
+                for job, vector in zip(pending_embeddings, vectors):
+                    job.embedding = vector
+
+        # Skills that aren't in the taxonomy, created in one statement
+        dialect_insert = dialect_insert_for(self.engine)
+        if new_skill_names:
+            new_rows = [
+                {"name": name, "category": "other", "job_count": 0}
+                for name in new_skill_names.values()
+            ]
+            if dialect_insert is not None:
+                session.execute(
+                    dialect_insert(Skill).on_conflict_do_nothing(index_elements=[Skill.name]),
+                    new_rows
+                )
+            else:
+                session.add_all(Skill(**row) for row in new_rows)
+                session.flush()
+            for name, skill_id in session.execute(
+                select(Skill.name, Skill.id).where(Skill.name.in_(new_skill_names.values()))
+            ):
+                skill_map.setdefault(name.lower(), skill_id)
+
+        # Every job-skill link in the chunk, inserted in one statement
+        links = {
+            (job_id, skill_map[skill_name.lower()])
+            for job_id, skill_names in job_skill_names
+            for skill_name in skill_names
+        }
+        if links:
+            link_rows = [
+                {"job_id": job_id, "skill_id": skill_id, "is_required": True}
+                for job_id, skill_id in links
+            ]
+            if self._can_copy():
+                self._copy_rows(
+                    session, "job_skills", ("job_id", "skill_id", "is_required"),
+                    [(row["job_id"], row["skill_id"], row["is_required"]) for row in link_rows]
+                )
+            elif dialect_insert is not None:
+                session.execute(
+                    dialect_insert(JobSkill).on_conflict_do_nothing(
+                        index_elements=[JobSkill.job_id, JobSkill.skill_id]
+                    ),
+                    link_rows
+                )
+            else:
+                session.add_all(JobSkill(**row) for row in link_rows)
 
-        session.commit()
-        print(f"✓ Migrated skills for {migrated_count} jobs")
-        return migrated_count
+        return len(job_skill_names), {skill_id for _, skill_id in links}
+
+    def _can_copy(self) -> bool:
+        """Whether bulk loads can use Postgres COPY through psycopg2."""
+        return self.engine.dialect.name == 'postgresql' and self.engine.dialect.driver == 'psycopg2'
+
+    def _copy_rows(self, session: Session, table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+        """Bulk load ``rows`` with COPY, skipping rows that conflict with existing ones.
+
+        COPY can't handle conflicts itself, so rows are copied into a temporary
+        table and moved across with INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+        Runs on the session's connection, inside its current transaction.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        staging = f"{table}_staging"
+        column_list = ", ".join(columns)
+        cursor = session.connection().connection.cursor()
+        try:
+            # One-off bulk load: don't wait on WAL flushes for this transaction
+            cursor.execute("SET LOCAL synchronous_commit = OFF")
+            cursor.execute(f"DROP TABLE IF EXISTS pg_temp.{staging}")
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT CSV)", buffer)
+            cursor.execute(
+                f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT DO NOTHING"
+            )
+        finally:
+            cursor.close()
 
     def create_indexes(self) -> bool:
         """Create additional indexes for performance."""
@@ -154,33 +333,83 @@ class DatabaseMigrator:
                 if 'postgresql' in self.db_url:
                     print("Creating performance indexes...")
 
-                    # GIN index for full-text search on job title and description
+                    # More sort memory makes the GIN/HNSW builds below faster
+                    conn.execute(text("SET LOCAL maintenance_work_mem = '256MB'"))
+
+                    # The per-column expression indexes built by earlier versions
+                    # are superseded by the search_tsv index below
+                    conn.execute(text("DROP INDEX IF EXISTS idx_job_title_gin"))
+                    conn.execute(text("DROP INDEX IF EXISTS idx_job_description_gin"))
+
+                    # Weighted tsvector over title/company/description, kept in
+                    # sync by Postgres, backing DatabaseClient.search_jobs
                     conn.execute(text("""
-                                      CREATE INDEX IF NOT EXISTS idx_job_title_gin
-                                          ON jobs USING gin(to_tsvector('english', title))
+                                      ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                                          GENERATED ALWAYS AS (
+                                              setweight(to_tsvector('english', COALESCE (title, '')), 'A') ||
+                                              setweight(to_tsvector('english', COALESCE (company, '')), 'B') ||
+                                              setweight(to_tsvector('english', COALESCE (description, '')), 'C')
+                                          ) STORED
                                       """))
 
                     conn.execute(text("""
-                                      CREATE INDEX IF NOT EXISTS idx_job_description_gin
-                                          ON jobs USING gin(to_tsvector('english', COALESCE (description, '')))
+                                      CREATE INDEX IF NOT EXISTS idx_job_search_tsv
+                                          ON jobs USING gin(search_tsv)
                                       """))
 
-                    # Vector index for semantic search (if pgvector is available)
+                    # Covering index for recent-job listings: the columns search
+                    # returns are stored in the index, allowing index-only scans.
+                    # (A rolling "last N days" predicate isn't possible here since
+                    # index predicates can't use CURRENT_DATE.)
+                    conn.execute(text("""
+                                      CREATE INDEX IF NOT EXISTS idx_jobs_recent_cover
+                                          ON jobs (posting_date DESC)
+                                          INCLUDE (title, company, location, url, source)
+                                      """))
+
+                    # HNSW index for semantic search (needs pgvector 0.7+ for
+                    # halfvec). Unlike ivfflat it can be built on an empty table.
+                    # Run it in a savepoint so a failure doesn't abort the
+                    # transaction holding the other indexes.
                     try:
-                        conn.execute(text("""
-                                          CREATE INDEX IF NOT EXISTS idx_job_embedding
-                                              ON jobs USING ivfflat (embedding vector_cosine_ops)
-                                              WITH (lists = 100)
-                                          """))
-                    except:
-                        print("   Note: IVFFlat index requires data in table first")
-
-                    # Trigram indexes for fuzzy matching
+                        with conn.begin_nested():
+                            conn.execute(text("""
+                                              CREATE INDEX IF NOT EXISTS idx_job_embedding_hnsw
+                                                  ON jobs USING hnsw (embedding halfvec_cosine_ops)
+                                              """))
+                    except SQLAlchemyError:
+                        print("   Note: HNSW halfvec index requires pgvector 0.7 or newer")
+
+                    # Skill -> jobs postings for search_jobs' skills filter,
+                    # get_skill_trends and recommend_jobs; create_all doesn't
+                    # add indexes to an existing job_skills table
+                    conn.execute(text("""
+                                      CREATE INDEX IF NOT EXISTS idx_job_skill_skill_job
+                                          ON job_skills (skill_id, job_id)
+                                      """))
+
+                    # Serves get_top_skills' ORDER BY job_count DESC LIMIT n
+                    conn.execute(text("""
+                                      CREATE INDEX IF NOT EXISTS idx_skill_job_count_name
+                                          ON skills (job_count DESC, name)
+                                      """))
+
+                    # Trigram indexes for fuzzy matching and ILIKE '%...%' filters
                     conn.execute(text("""
                                       CREATE INDEX IF NOT EXISTS idx_skill_name_trgm
                                           ON skills USING gin(name gin_trgm_ops)
                                       """))
 
+                    conn.execute(text("""
+                                      CREATE INDEX IF NOT EXISTS idx_job_location_trgm
+                                          ON jobs USING gin(location gin_trgm_ops)
+                                      """))
+
+                    conn.execute(text("""
+                                      CREATE INDEX IF NOT EXISTS idx_job_company_trgm
+                                          ON jobs USING gin(company gin_trgm_ops)
+                                      """))
+
                     conn.commit()
                     print("✓ Performance indexes created")
 
@@ -206,7 +435,14 @@ class DatabaseMigrator:
             Base.metadata.create_all(bind=self.engine)
             print("✓ Database schema created/updated")
 
-            # Step 3: Migrate data
+            # Step 3: Convert embedding columns to halfvec before any ORM
+            # access to them, so the migration below reads and writes the
+            # type Job.embedding is mapped to
+            with self.engine.begin() as conn:
+                for column in convert_embedding_columns(conn):
+                    print(f"✓ Converted {column} to halfvec")
+
+            # Step 4: Migrate data
             with self.SessionLocal() as session:
                 # Create skills table
                 skill_map = self.create_skills_table(session)
@@ -218,10 +454,10 @@ class DatabaseMigrator:
                 else:
                     print("ℹ No existing jobs to migrate")
 
-            # Step 4: Create indexes
+            # Step 5: Create indexes
             self.create_indexes()
 
-            # Step 5: Log migration
+            # Step 6: Log migration
             with self.SessionLocal() as session:
                 log_entry = ScrapingLog(
                     source="migration",
@@ -316,10 +552,15 @@ def main():
         type=str,
         help="Override database URL from config"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes used for skill extraction (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
-    migrator = DatabaseMigrator(args.db_url)
+    migrator = DatabaseMigrator(args.db_url, workers=args.workers)
 
     if args.rollback:
         success = migrator.rollback_migration()
@@ -5,9 +5,28 @@ from sqlalchemy import (
     Date, DateTime, Integer, String, Text, Float, Boolean,
     ForeignKey, UniqueConstraint, Index, JSON, func
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import HALFVEC
 import uuid
 
+# Output size of the all-MiniLM-L6-v2 model used by search.vectorizer
+EMBEDDING_DIM = 384
+
+# pgvector halfvec on Postgres (packed float16: half the size of vector, with
+# negligible loss for cosine ranking); JSON arrays on other backends such as SQLite
+class _JSONVector(TypeDecorator):
+    """JSON array column that also accepts numpy vectors from search.vectorizer."""
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.tolist() if hasattr(value, "tolist") else value
+
+
+EmbeddingType = _JSONVector().with_variant(HALFVEC(EMBEDDING_DIM), "postgresql")
+
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
@@ -56,14 +75,16 @@ class Job(Base):
     relevance_score: Mapped[Optional[float]] = mapped_column(Float)
     days_old: Mapped[Optional[int]] = mapped_column(Integer)
     
-    # Vector embedding for semantic search (stored as JSON for compatibility)
-    embedding: Mapped[Optional[dict]] = mapped_column(JSON)
+    # Vector embedding for semantic search.
+    # Deferred so listing queries don't load it unless it is accessed.
+    embedding: Mapped[Optional[List[float]]] = mapped_column(EmbeddingType, deferred=True)
     
     # Relationships
     skills: Mapped[List["Skill"]] = relationship(
         secondary="job_skills",
         back_populates="jobs",
-        lazy="selectin"  # Eager load skills
+        # Not loaded implicitly; queries that need skills use selectinload
+        lazy="raise_on_sql"
     )
     
     user_interactions: Mapped[List["UserJobInteraction"]] = relationship(
@@ -114,6 +135,11 @@ class Skill(Base):
         cascade="all, delete-orphan"
     )
     
+    __table_args__ = (
+        # Top-N skills by demand straight from the index (see get_top_skills)
+        Index('idx_skill_job_count_name', job_count.desc(), name),
+    )
+
     def __repr__(self):
         return f"<Skill(id={self.id}, name='{self.name}', category='{self.category}')>"
 
@@ -142,6 +168,7 @@ class JobSkill(Base):
     # Indexes
     __table_args__ = (
         Index('idx_job_skill_composite', job_id, skill_id),
+        Index('idx_job_skill_skill_job', skill_id, job_id),
     )
 
 
@@ -173,7 +200,7 @@ class User(Base):
     experience_level: Mapped[Optional[str]] = mapped_column(String(50))
     
     # Profile embedding for similarity matching
-    profile_embedding: Mapped[Optional[dict]] = mapped_column(JSON)
+    profile_embedding: Mapped[Optional[List[float]]] = mapped_column(EmbeddingType)
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -9,17 +9,19 @@ INSTRUCTIONS FOR CLAUDE CODE:
 3. This uses the new DatabaseClient and proper skills handling
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from datetime import datetime
 
+from sqlalchemy import func, select
+
 from data_sources.adzuna_client import AdzunaClient
 from data_sources.ziprecruiter_client import ZipRecruiterClient
 from data_sources.usajobs_client import USAJobsClient
 from data_sources.jobspikr_client import JobsPikrClient
 from data_sources.base import JobSource
-from parsers.normalize import normalize_job, deduplicate_jobs, \
-    batch_normalize_jobs  # [CHANGED] Added batch_normalize_jobs
+from parsers.normalize import normalize_job, deduplicate_jobs
 from db.models import Job, ScrapingLog  # [CHANGED] Added ScrapingLog
 from db.db_client import get_db_client  # [CHANGED] Using new client instead of get_session, init_db
 
@@ -30,12 +32,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Data sources, built once per process; the clients share one keep-alive
+# HTTP session (see data_sources._http), so repeated runs reuse connections
+_SOURCES: List[JobSource] = [
+    AdzunaClient(),
+    ZipRecruiterClient(),
+    USAJobsClient(),
+    JobsPikrClient(),
+]
+
+
+def _fetch_one(
+        source: JobSource,
+        query: str,
+        location: str
+) -> Tuple[str, List[Dict[str, Any]], Optional[Exception], float]:
+    """Fetch from one source, returning (source_name, raw_jobs, error, seconds taken)."""
+    started = datetime.utcnow()
+    try:
+        raw_jobs = list(source.fetch_jobs(query=query, location=location) or [])
+        error = None
+    except Exception as e:
+        raw_jobs, error = [], e
+    return source.source_name, raw_jobs, error, (datetime.utcnow() - started).total_seconds()
+
 
 def run_pipeline(
         query: str = "software engineer",
         location: str = "United States",
         save_to_db: bool = True
-) -> List[Job]:
+) -> List[Dict[str, Any]]:
     """
     Run a single ingestion cycle with skills extraction and return normalized jobs.
 
@@ -45,7 +71,7 @@ def run_pipeline(
         save_to_db: Whether to save jobs to database
 
     Returns:
-        List of Job objects with extracted skills
+        List of normalized job dicts, each with its extracted ``skills`` names
     """
     logger.info(f"Starting pipeline run at {datetime.now()}")
     logger.info(f"Query: '{query}', Location: '{location}'")
@@ -57,98 +83,101 @@ def run_pipeline(
     # Track pipeline start time for logging
     pipeline_start = datetime.utcnow()
 
-    # Configure data sources
-    sources: List[JobSource] = [
-        AdzunaClient(),
-        ZipRecruiterClient(),
-        USAJobsClient(),
-        JobsPikrClient(),
-    ]
+    sources = _SOURCES
 
-    all_normalized_jobs = []
     total_raw_jobs = 0
     source_stats = {}  # [CHANGED] Track stats per source
+    scraping_runs: List[Dict[str, Any]] = []  # Written to scraping_logs at the end
+
+    # Fetch from all sources concurrently; the calls are network-bound so
+    # the fetch phase takes as long as the slowest source, not their sum
+    logger.info(f"Fetching jobs from {', '.join(s.source_name for s in sources)}...")
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = [executor.submit(_fetch_one, source, query, location) for source in sources]
+        fetched: Dict[str, Tuple[List[Dict[str, Any]], Optional[Exception], float]] = {}
+        for future in as_completed(futures):
+            source_name, raw_jobs, error, duration = future.result()
+            fetched[source_name] = (raw_jobs, error, duration)
+
+    total_normalized = 0
+
+    def normalized_jobs():
+        """Yield every source's normalized jobs, recording per-source stats."""
+        nonlocal total_raw_jobs, total_normalized
+        # Process in source order so logs and stats don't depend on completion order
+        for source in sources:
+            source_name = source.source_name
+            # Popped so each source's raw payloads are freed once normalized
+            raw_jobs_list, error, fetch_duration = fetched.pop(source_name)
+
+            # [CHANGED] Track source-specific stats
+            source_start = datetime.utcnow()
+            source_fetched = 0
+            source_errors = 0
 
-    for source in sources:
-        source_name = source.source_name
-        logger.info(f"Fetching jobs from {source_name}...")
-
-        # [CHANGED] Track source-specific stats
-        source_start = datetime.utcnow()
-        source_fetched = 0
-        source_errors = 0
-
-        try:
-            # Fetch raw jobs from source
-            raw_jobs = source.fetch_jobs(query=query, location=location)
-
-            if not raw_jobs:
-                logger.warning(f"No jobs returned from {source_name} (check API credentials)")
-                # [CHANGED] Log the failed attempt
-                client.log_scraping_run(
-                    source=source_name,
-                    jobs_fetched=0,
-                    jobs_inserted=0,
-                    status='no_data',
-                    error_message="No jobs returned - check API credentials"
-                )
-                continue
-
-            # Convert to list if needed
-            raw_jobs_list = list(raw_jobs) if not isinstance(raw_jobs, list) else raw_jobs
-            source_fetched = len(raw_jobs_list)
-            total_raw_jobs += source_fetched
-            logger.info(f"Fetched {source_fetched} raw jobs from {source_name}")
-
-            # [CHANGED] Use batch normalization for better performance
             try:
-                normalized_batch = batch_normalize_jobs(raw_jobs_list, source_name)
-                all_normalized_jobs.extend(normalized_batch)
+                if error is not None:
+                    raise error
+
+                if not raw_jobs_list:
+                    logger.warning(f"No jobs returned from {source_name} (check API credentials)")
+                    # [CHANGED] Log the failed attempt
+                    scraping_runs.append({
+                        'source': source_name,
+                        'status': 'no_data',
+                        'error_message': "No jobs returned - check API credentials",
+                    })
+                    continue
 
-                # Log skills extraction success
-                jobs_with_skills = sum(1 for job in normalized_batch if job.get("skills"))
-                logger.info(f"Extracted skills for {jobs_with_skills}/{len(normalized_batch)} jobs from {source_name}")
+                source_fetched = len(raw_jobs_list)
+                total_raw_jobs += source_fetched
+                logger.info(f"Fetched {source_fetched} raw jobs from {source_name} in {fetch_duration:.1f}s")
 
-            except Exception as e:
-                logger.error(f"Error in batch normalization for {source_name}: {e}")
-                # Fall back to individual normalization
+                # Normalize one job at a time, so no per-source copy is built
+                # and a bad record only skips itself
+                source_normalized = 0
+                jobs_with_skills = 0
                 for raw_job in raw_jobs_list:
                     try:
                         normalized = normalize_job(raw_job, source_name)
-                        all_normalized_jobs.append(normalized)
                     except Exception as e:
                         logger.error(f"Error normalizing job from {source_name}: {e}")
                         source_errors += 1
                         continue
+                    source_normalized += 1
+                    if normalized.get("skills"):
+                        jobs_with_skills += 1
+                    yield normalized
 
-            # [CHANGED] Store source statistics
-            source_stats[source_name] = {
-                'fetched': source_fetched,
-                'errors': source_errors,
-                'duration': (datetime.utcnow() - source_start).total_seconds()
-            }
+                total_normalized += source_normalized
 
-        except Exception as e:
-            logger.error(f"Error fetching from {source_name}: {e}")
-            # [CHANGED] Log the failed source
-            client.log_scraping_run(
-                source=source_name,
-                jobs_fetched=0,
-                jobs_inserted=0,
-                status='failed',
-                error_message=str(e)
-            )
-            continue
-
-    # Deduplicate jobs
-    logger.info(f"Deduplicating {len(all_normalized_jobs)} normalized jobs...")
-    unique_jobs = deduplicate_jobs(all_normalized_jobs)
-    logger.info(f"Retained {len(unique_jobs)} unique jobs after deduplication")
+                # Log skills extraction success
+                logger.info(f"Extracted skills for {jobs_with_skills}/{source_normalized} jobs from {source_name}")
+
+                # [CHANGED] Store source statistics
+                source_stats[source_name] = {
+                    'fetched': source_fetched,
+                    'errors': source_errors,
+                    'duration': fetch_duration + (datetime.utcnow() - source_start).total_seconds()
+                }
+
+            except Exception as e:
+                logger.error(f"Error fetching from {source_name}: {e}")
+                # [CHANGED] Log the failed source
+                scraping_runs.append({
+                    'source': source_name,
+                    'status': 'failed',
+                    'error_message': str(e),
+                })
+                continue
+
+    # Deduplicate as the jobs are normalized, so duplicates are never stored
+    unique_jobs = deduplicate_jobs(normalized_jobs())
+    logger.info(f"Retained {len(unique_jobs)} unique jobs of {total_normalized} normalized after deduplication")
 
     # [CHANGED] Save to database using new batch upsert method
     inserted = 0
     updated = 0
-    job_models = []
 
     if save_to_db and unique_jobs:
         logger.info(f"Saving {len(unique_jobs)} jobs to database...")
@@ -157,60 +186,41 @@ def run_pipeline(
             inserted, updated = client.batch_upsert_jobs(unique_jobs)
             logger.info(f"Database operation complete: {inserted} inserted, {updated} updated")
 
-            # [CHANGED] Get the actual job models for return value
+            # Log comprehensive statistics, both counts in one query
             with client.get_session() as session:
-                # Fetch the jobs we just inserted/updated
-                job_models = session.query(Job).order_by(Job.created_at.desc()).limit(len(unique_jobs)).all()
+                total_in_db, jobs_with_skills = session.execute(
+                    select(func.count(Job.id), func.count(Job.id).filter(Job.skills.any()))
+                ).one()
 
-                # Log comprehensive statistics
-                total_in_db = session.query(Job).count()
-                jobs_with_skills = session.query(Job).filter(
-                    Job.skills != None
-                ).count()
+            # [CHANGED] Get top skills for logging
+            top_skills = client.get_top_skills(limit=10)
 
-                # [CHANGED] Get top skills for logging
-                top_skills = client.get_top_skills(limit=10)
-
-                logger.info(f"Database now contains {total_in_db} total jobs")
-                logger.info(f"{jobs_with_skills} jobs have extracted skills")
-                if top_skills:
-                    logger.info(f"Top skills: {', '.join([f'{skill}({count})' for skill, count in top_skills[:5]])}")
+            logger.info(f"Database now contains {total_in_db} total jobs")
+            logger.info(f"{jobs_with_skills} jobs have extracted skills")
+            if top_skills:
+                logger.info(f"Top skills: {', '.join([f'{skill}({count})' for skill, count in top_skills[:5]])}")
 
         except Exception as e:
             logger.error(f"Error saving to database: {e}")
-            # Still try to create models for return value
-            for job_data in unique_jobs:
-                try:
-                    job = Job(**job_data)
-                    job_models.append(job)
-                except Exception as e:
-                    logger.error(f"Error creating Job model: {e}")
-                    continue
-    else:
-        # Create Job models without saving
-        for job_data in unique_jobs:
-            try:
-                job = Job(**job_data)
-                job_models.append(job)
-            except Exception as e:
-                logger.error(f"Error creating Job model: {e}")
-                continue
 
-    # [CHANGED] Log the complete pipeline run
+    # [CHANGED] Log the complete pipeline run, together with the per-source
+    # entries collected above, in a single insert
     pipeline_duration = (datetime.utcnow() - pipeline_start).total_seconds()
-    client.log_scraping_run(
-        source='pipeline_complete',
-        jobs_fetched=total_raw_jobs,
-        jobs_inserted=inserted,
-        jobs_updated=updated,
-        status='completed'
-    )
+    scraping_runs.append({
+        'source': 'pipeline_complete',
+        'jobs_fetched': total_raw_jobs,
+        'jobs_inserted': inserted,
+        'jobs_updated': updated,
+        'status': 'completed',
+        'started_at': pipeline_start,
+    })
+    client.log_scraping_runs(scraping_runs)
 
     # Log summary statistics
     logger.info("=" * 50)
     logger.info("Pipeline Summary:")
     logger.info(f"  Total raw jobs fetched: {total_raw_jobs}")
-    logger.info(f"  Jobs after normalization: {len(all_normalized_jobs)}")
+    logger.info(f"  Jobs after normalization: {total_normalized}")
     logger.info(f"  Unique jobs after deduplication: {len(unique_jobs)}")
     logger.info(f"  Jobs inserted to DB: {inserted}")
     logger.info(f"  Jobs updated in DB: {updated}")
@@ -224,17 +234,22 @@ def run_pipeline(
                         f"{stats['errors']} errors, {stats['duration']:.2f}s")
 
     # Log skills statistics
-    if job_models:
-        total_skills = sum(len(job.skills or []) for job in job_models)
-        jobs_with_skills = sum(1 for job in job_models if job.skills)
-        avg_skills = total_skills / len(job_models) if job_models else 0
-
-        logger.info(f"  Jobs with skills: {jobs_with_skills}/{len(job_models)}")
+    if unique_jobs:
+        total_skills = 0
+        jobs_with_skills = 0
+        for job in unique_jobs:
+            skills = job.get("skills")
+            if skills:
+                total_skills += len(skills)
+                jobs_with_skills += 1
+        avg_skills = total_skills / len(unique_jobs)
+
+        logger.info(f"  Jobs with skills: {jobs_with_skills}/{len(unique_jobs)}")
         logger.info(f"  Average skills per job: {avg_skills:.1f}")
 
     logger.info("=" * 50)
 
-    return job_models
+    return unique_jobs
 
 
 def run_incremental_update():
@@ -244,32 +259,17 @@ def run_incremental_update():
     # [CHANGED] Use the new client
     client = get_db_client()
 
-    # Get existing URLs using the client
-    with client.get_session() as session:
-        existing_urls = set(
-            url for (url,) in session.query(Job.url).filter(Job.url != None).all()
-        )
-        logger.info(f"Found {len(existing_urls)} existing job URLs in database")
-
     # Run normal pipeline without immediate save
     new_jobs = run_pipeline(save_to_db=False)
 
-    # Filter to only truly new jobs
-    new_job_data = []
-    for job in new_jobs:
-        if job.url and job.url not in existing_urls:
-            # Convert Job model back to dict for batch upsert
-            job_dict = {
-                'title': job.title,
-                'company': job.company,
-                'location': job.location,
-                'description': job.description,
-                'url': job.url,
-                'source': job.source,
-                'posting_date': job.posting_date,
-                'skills': [skill.name for skill in job.skills] if job.skills else []
-            }
-            new_job_data.append(job_dict)
+    # Filter to only truly new jobs; the database checks just the fetched
+    # URLs rather than every stored URL being loaded here
+    existing_urls = client.existing_urls([job['url'] for job in new_jobs if job.get('url')])
+    logger.info(f"{len(existing_urls)} fetched job URLs are already in the database")
+    new_job_data = [
+        job for job in new_jobs
+        if job.get('url') and job['url'] not in existing_urls
+    ]
 
     # [CHANGED] Use batch upsert for new jobs
     if new_job_data:
@@ -299,23 +299,23 @@ def test_pipeline():
     # Display sample results
     logger.info(f"\nSample of extracted jobs:")
     for job in jobs[:3]:
-        logger.info(f"\nJob: {job.title}")
-        logger.info(f"  Company: {job.company}")
-        logger.info(f"  Location: {job.location}")
-        logger.info(f"  Skills: {', '.join([s.name for s in job.skills]) if job.skills else 'None'}")
-        logger.info(f"  URL: {job.url}")
+        logger.info(f"\nJob: {job['title']}")
+        logger.info(f"  Company: {job['company']}")
+        logger.info(f"  Location: {job['location']}")
+        logger.info(f"  Skills: {', '.join(job['skills']) if job.get('skills') else 'None'}")
+        logger.info(f"  URL: {job['url']}")
 
     # [CHANGED] Test database operations
     if jobs:
         logger.info("\nTesting database operations...")
         test_job_data = {
-            'title': jobs[0].title,
-            'company': jobs[0].company,
-            'location': jobs[0].location,
-            'description': jobs[0].description,
+            'title': jobs[0]['title'],
+            'company': jobs[0]['company'],
+            'location': jobs[0]['location'],
+            'description': jobs[0]['description'],
             'url': f"test_{datetime.now().timestamp()}",  # Unique URL for test
             'source': 'test',
-            'skills': [s.name for s in jobs[0].skills] if jobs[0].skills else []
+            'skills': list(jobs[0].get('skills') or [])
         }
 
         test_job = client.upsert_job(test_job_data)
@@ -1,75 +1,128 @@
+import hashlib
+import sys
 from datetime import datetime, date
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from parsers.skills_extractor import extract_skills
 
 
 def _parse_date(value: Optional[str]) -> Optional[date]:
-    if not value:
+    if not value or len(value) < 8:
         return None
     try:
-        return datetime.fromisoformat(value.replace("Z", "")).date()
+        # Every source sends YYYY-MM-DD, optionally followed by a time; read
+        # the date fields directly instead of building a datetime
+        if len(value) >= 10 and value[4] == "-" and value[7] == "-":
+            return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        # Python 3.11's fromisoformat accepts a trailing "Z" as UTC
+        return datetime.fromisoformat(value).date()
     except ValueError:
         return None
 
 
+def _first(d: Dict[str, Any], *keys: str, default: Any = "") -> Any:
+    """Return the first truthy value among ``keys`` in ``d``."""
+    get = d.get
+    for key in keys:
+        value = get(key)
+        if value:
+            return value
+    return default
+
+
+def _path(d: Dict[str, Any], *keys: str, default: Any = "") -> Any:
+    """Follow ``keys`` through nested dicts, returning ``default`` if any step is missing."""
+    for key in keys:
+        d = d.get(key) if isinstance(d, dict) else None
+        if d is None:
+            return default
+    return d
+
+
+def _norm_adzuna(raw: Dict[str, Any]) -> Dict[str, Any]:
+    get = raw.get
+    return {
+        "title": get("title", ""),
+        "company": _path(raw, "company", "display_name"),
+        "location": _path(raw, "location", "display_name"),
+        "description": get("description", ""),
+        "url": get("redirect_url", ""),
+        "posting_date": _parse_date(get("created")),
+    }
+
+
+def _norm_ziprecruiter(raw: Dict[str, Any]) -> Dict[str, Any]:
+    get = raw.get
+    return {
+        "title": get("name", ""),
+        "company": _path(raw, "hiring_company", "name"),
+        "location": get("location", ""),
+        "description": get("snippet", ""),
+        "url": get("url", ""),
+        "posting_date": _parse_date(get("posted_time")),
+    }
+
+
+def _norm_usajobs(raw: Dict[str, Any]) -> Dict[str, Any]:
+    # Handle USAJobs specific structure
+    position_info = raw.get("MatchedObjectDescriptor") or {}
+    get = position_info.get
+    return {
+        "title": get("PositionTitle", ""),
+        "company": get("OrganizationName", "Federal Government"),
+        "location": _extract_usajobs_location(position_info),
+        "description": _path(position_info, "UserArea", "Details", "JobSummary"),
+        "url": get("PositionURI", ""),
+        "posting_date": _parse_date(get("PublicationStartDate")),
+    }
+
+
+def _norm_jobspikr(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": _first(raw, "title", "job_title"),
+        "company": _first(raw, "company_name", "company"),
+        "location": _first(raw, "location", "job_location"),
+        "description": _first(raw, "description", "job_description"),
+        "url": _first(raw, "url", "job_link"),
+        "posting_date": _parse_date(_first(raw, "post_date", "posted_date", default=None)),
+    }
+
+
+def _norm_default(raw: Dict[str, Any]) -> Dict[str, Any]:
+    # Generic normalization for unknown sources
+    get = raw.get
+    return {
+        "title": get("title", ""),
+        "company": get("company", ""),
+        "location": get("location", ""),
+        "description": get("description", ""),
+        "url": get("url", ""),
+        "posting_date": get("posting_date"),
+    }
+
+
+# Source name -> function mapping a raw payload to the internal schema
+# (without ``source`` and ``skills``, which normalize_job adds)
+_NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "adzuna": _norm_adzuna,
+    "ziprecruiter": _norm_ziprecruiter,
+    "usajobs": _norm_usajobs,
+    "jobspikr": _norm_jobspikr,
+}
+
+
 def normalize_job(raw: Dict[str, Any], source: str) -> Dict[str, Any]:
     """Convert a raw job payload into the internal schema with skills extraction."""
 
     # Base normalization based on source
-    if source == "adzuna":
-        normalized = {
-            "title": raw.get("title", ""),
-            "company": raw.get("company", {}).get("display_name", ""),
-            "location": raw.get("location", {}).get("display_name", ""),
-            "description": raw.get("description", ""),
-            "source": source,
-            "url": raw.get("redirect_url", ""),
-            "posting_date": _parse_date(raw.get("created")),
-        }
-    elif source == "ziprecruiter":
-        company = raw.get("hiring_company", {})
-        normalized = {
-            "title": raw.get("name", ""),
-            "company": company.get("name", ""),
-            "location": raw.get("location", ""),
-            "description": raw.get("snippet", ""),
-            "source": source,
-            "url": raw.get("url", ""),
-            "posting_date": _parse_date(raw.get("posted_time")),
-        }
-    elif source == "usajobs":
-        # Handle USAJobs specific structure
-        position_info = raw.get("MatchedObjectDescriptor", {})
-        normalized = {
-            "title": position_info.get("PositionTitle", ""),
-            "company": position_info.get("OrganizationName", "Federal Government"),
-            "location": _extract_usajobs_location(position_info),
-            "description": position_info.get("UserArea", {}).get("Details", {}).get("JobSummary", ""),
-            "source": source,
-            "url": position_info.get("PositionURI", ""),
-            "posting_date": _parse_date(position_info.get("PublicationStartDate")),
-        }
-    elif source == "jobspikr":
-        normalized = {
-            "title": raw.get("title", "") or raw.get("job_title", ""),
-            "company": raw.get("company_name", "") or raw.get("company", ""),
-            "location": raw.get("location", "") or raw.get("job_location", ""),
-            "description": raw.get("description", "") or raw.get("job_description", ""),
-            "source": source,
-            "url": raw.get("url", "") or raw.get("job_link", ""),
-            "posting_date": _parse_date(raw.get("post_date") or raw.get("posted_date")),
-        }
-    else:
-        # Generic normalization for unknown sources
-        normalized = {
-            "title": raw.get("title", ""),
-            "company": raw.get("company", ""),
-            "location": raw.get("location", ""),
-            "description": raw.get("description", ""),
-            "source": source,
-            "url": raw.get("url", ""),
-            "posting_date": raw.get("posting_date"),
-        }
+    normalized = _NORMALIZERS.get(source, _norm_default)(raw)
+    normalized["source"] = sys.intern(source)
+    # Companies and locations repeat across many postings; share one string
+    # per distinct value instead of keeping a copy per job
+    for field in ("company", "location"):
+        value = normalized[field]
+        if value and type(value) is str:
+            normalized[field] = sys.intern(value)
 
     # Extract skills from title and description
     text_for_extraction = f"{normalized.get('title', '')} {normalized.get('description', '')}"
@@ -104,32 +157,70 @@ def _extract_usajobs_location(position_info: Dict[str, Any]) -> str:
     return ""
 
 
-def batch_normalize_jobs(raw_jobs: list, source: str) -> list:
-    """Normalize a batch of jobs from the same source."""
-    return [normalize_job(job, source) for job in raw_jobs]
+def batch_normalize_jobs(raw_jobs: Iterable[Dict[str, Any]], source: str) -> Iterator[Dict[str, Any]]:
+    """Normalize a batch of jobs from the same source, yielding them one at a time."""
+    for job in raw_jobs:
+        yield normalize_job(job, source)
 
 
-def deduplicate_jobs(jobs: list) -> list:
-    """Remove duplicate jobs based on URL or title+company combination."""
-    seen_urls = set()
-    seen_combinations = set()
-    unique_jobs = []
+# Query parameters that only track the click, not which job is linked
+_TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "src"})
 
-    for job in jobs:
-        url = job.get("url", "")
-        title_company = (job.get("title", "").lower(), job.get("company", "").lower())
 
-        # Skip if we've seen this exact URL
-        if url and url in seen_urls:
-            continue
+def canonical_url(url: str) -> str:
+    """Return ``url`` with case, fragment and tracking parameters normalized away."""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in _TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        urlencode(query),
+        "",
+    ))
+
+
+def _text_key(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
 
-        # Skip if we've seen this title+company combination
-        if title_company in seen_combinations:
+def _content_key(job: Dict[str, Any]) -> bytes:
+    """Digest of a job's normalized title, company and location."""
+    text = "|".join(_text_key(job.get(field)) for field in ("title", "company", "location"))
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def iter_unique_jobs(jobs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield the jobs not already seen by URL or title+company+location.
+
+    URLs are compared in canonical form and the other fields ignoring case
+    and whitespace (as a digest), all through one set, so this is linear in
+    the number of jobs and catches the same posting listed by several
+    sources under different URLs. Only those keys are kept, so duplicates
+    are dropped as they stream past rather than held until the end.
+    """
+    seen = set()  # canonical URLs (str) and content digests (bytes)
+    add_seen = seen.add
+
+    for job in jobs:
+        url = job.get("url")
+        url = canonical_url(url) if url else ""
+        content = _content_key(job)
+
+        # Skip if we've seen this URL or this title+company+location
+        if (url and url in seen) or content in seen:
             continue
 
         if url:
-            seen_urls.add(url)
-        seen_combinations.add(title_company)
-        unique_jobs.append(job)
+            add_seen(url)
+        add_seen(content)
+        yield job
+
 
-    return unique_jobs
\ No newline at end of file
+def deduplicate_jobs(jobs: Iterable[Dict[str, Any]]) -> list:
+    """Remove duplicate jobs based on URL or title+company+location (see iter_unique_jobs)."""
+    return list(iter_unique_jobs(jobs))
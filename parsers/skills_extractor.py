@@ -1,8 +1,10 @@
-from typing import List, Set, Optional
+from collections import OrderedDict
+from typing import Dict, List, Set, Optional, Tuple
+import hashlib
+import html
 import re
 import sys
-import spacy
-from spacy.matcher import PhraseMatcher
+import threading
 
 # Common software engineering skills taxonomy
 SKILLS_TAXONOMY = {
@@ -83,32 +85,39 @@ SKILLS_TAXONOMY = {
     ]
 }
 
+# The taxonomy flattened once at import: (category, name, lowercase name)
+SKILLS_TAXONOMY_FLAT = tuple(
+    (category, name, name.lower())
+    for category, names in SKILLS_TAXONOMY.items()
+    for name in names
+)
+
+# Lowercase skill name -> category; the first category listing a name wins
+SKILL_NAME_TO_CATEGORY = {
+    lower: category for category, _, lower in reversed(SKILLS_TAXONOMY_FLAT)
+}
+
+# Patterns used on every description, compiled once
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SEPARATOR_RE = re.compile(r'[/\-_]')
+_WHITESPACE_RE = re.compile(r'\s+')
+# A word, possibly joined by or ending in ".", "+" or "#" (node.js, c++, c#)
+_TOKEN_RE = re.compile(r'\w[\w.+#]*')
+_DIGIT_RE = re.compile(r'\d')
+# Years of experience patterns (e.g., "3+ years python"), run on lowercased text
+_EXPERIENCE_RE = re.compile(r'(\d+\+?\s*(?:years?|yrs?)?\s*(?:of\s*)?)([\w\s\+\#\.]+)')
+
+
+def _tokens(text: str) -> List[str]:
+    """Split lowercased, preprocessed text into the tokens skills are matched on."""
+    return [token.rstrip('.') for token in _TOKEN_RE.findall(text)]
 
-class SkillsExtractor:
-    def __init__(self, model_name: str = "en_core_web_sm"):
-        """Initialize the skills extractor with spaCy model."""
-        try:
-            self.nlp = spacy.load(model_name)
-        except OSError:
-            # If model not found, download it
-            import subprocess
-            subprocess.run([sys.executable, "-m", "spacy", "download", model_name])
-            self.nlp = spacy.load(model_name)
-
-        # Initialize phrase matcher for multi-word skills
-        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-
-        # Add all skills to the matcher
-        all_skills = []
-        for category_skills in SKILLS_TAXONOMY.values():
-            all_skills.extend(category_skills)
-
-        # Create patterns for multi-word skills
-        patterns = [self.nlp.make_doc(skill) for skill in all_skills]
-        self.matcher.add("SKILLS", patterns)
 
+class SkillsExtractor:
+    def __init__(self):
+        """Initialize the skills extractor's phrase table."""
         # Create a set for fast single-word lookup
-        self.skill_set = {skill.lower() for skill in all_skills}
+        self.skill_set = set(SKILL_NAME_TO_CATEGORY)
 
         # Common skill variations and aliases
         self.aliases = {
@@ -130,66 +139,95 @@ class SkillsExtractor:
             "ui/ux": "user interface design"
         }
 
-    def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from job description text."""
+        # Every skill and alias keyed by its token sequence, so a description
+        # is matched in one pass of dictionary lookups over its token n-grams
+        # Values are the normalized display names, computed once here and
+        # interned, so a skill reached through several aliases is one string
+        # object in every result (and in the caches holding them)
+        self._canonical = {
+            name: sys.intern(self._normalize_skill(name))
+            for name in list(self.skill_set) + list(self.aliases)
+        }
+        self.phrases: Dict[str, str] = {}
+        for name, canonical in self._canonical.items():
+            key = " ".join(_tokens(self._preprocess_text(name).lower()))
+            self.phrases.setdefault(key, canonical)
+        # First tokens of multi-token phrases, and the longest phrase length
+        self._phrase_starts = {key.split(" ", 1)[0] for key in self.phrases if " " in key}
+        self._max_phrase_tokens = max(key.count(" ") + 1 for key in self.phrases)
+        # Display name -> category for everything the phrase table can emit,
+        # so categorizing a result is one lookup per skill
+        self._category_by_skill = {
+            canonical: SKILL_NAME_TO_CATEGORY[canonical.lower()]
+            for canonical in self.phrases.values()
+            if canonical.lower() in SKILL_NAME_TO_CATEGORY
+        }
+
+    def extract_skills(self, text: str, sort: bool = False) -> List[str]:
+        """Extract skills from job description text.
+
+        The order is unspecified unless ``sort`` is set; job skills are
+        stored as a set of links, so the ingest path doesn't pay for a sort.
+        """
         if not text:
             return []
 
-        # Clean and preprocess text
-        text = self._preprocess_text(text)
+        text = self.normalize_text(text)
+        if not text:
+            return []
+        found_skills = self._match(text)
+        return sorted(found_skills) if sort else list(found_skills)
+
+    def normalize_text(self, text: str) -> str:
+        """Preprocess and lowercase ``text``; extraction only depends on this form."""
+        return self._preprocess_text(text).lower()
 
-        # Process with spaCy
-        doc = self.nlp(text.lower())
+    def _match(self, text: str) -> Set[str]:
+        """Find the skills in text already passed through normalize_text."""
+        tokens = _tokens(text)
 
         found_skills = set()
 
-        # Find multi-word skills using PhraseMatcher
-        matches = self.matcher(doc)
-        for match_id, start, end in matches:
-            skill = doc[start:end].text
-            found_skills.add(self._normalize_skill(skill))
-
-        # Find single-word skills in tokens
-        for token in doc:
-            if token.text in self.skill_set:
-                found_skills.add(self._normalize_skill(token.text))
-
-        # Check for skill aliases
-        for alias, canonical in self.aliases.items():
-            if alias in text.lower():
-                found_skills.add(canonical)
-
-        # Look for years of experience patterns (e.g., "3+ years Python")
-        experience_pattern = r'(\d+\+?\s*(?:years?|yrs?)?\s*(?:of\s*)?)([\w\s\+\#\.]+)'
-        for match in re.finditer(experience_pattern, text, re.IGNORECASE):
-            potential_skill = match.group(2).strip().lower()
-            if potential_skill in self.skill_set:
-                found_skills.add(self._normalize_skill(potential_skill))
-
-        # Normalize all skills and remove duplicates
-        normalized_skills = set()
-        for skill in found_skills:
-            normalized = self._normalize_skill(skill)
-            normalized_skills.add(normalized)
-        
-        return sorted(list(normalized_skills))
+        # Find single- and multi-word skills and aliases, already normalized;
+        # every match is kept, so "ruby on rails" also yields "ruby" and "rails"
+        phrases = self.phrases
+        for i, token in enumerate(tokens):
+            skill = phrases.get(token)
+            if skill is not None:
+                found_skills.add(skill)
+            if token in self._phrase_starts:
+                for end in range(i + 2, min(i + self._max_phrase_tokens, len(tokens)) + 1):
+                    skill = phrases.get(" ".join(tokens[i:end]))
+                    if skill is not None:
+                        found_skills.add(skill)
+
+        # Look for years of experience patterns (e.g., "3+ years Python"),
+        # which need a number, so most descriptions skip the scan entirely
+        if _DIGIT_RE.search(text):
+            for match in _EXPERIENCE_RE.finditer(text):
+                potential_skill = match.group(2).strip()
+                if potential_skill in self.skill_set:
+                    found_skills.add(self._canonical[potential_skill])
+
+        return found_skills
 
     def _preprocess_text(self, text: str) -> str:
         """Clean and prepare text for processing."""
-        # Remove HTML tags if present
-        text = re.sub(r'<[^>]+>', ' ', text)
+        # Remove HTML tags if present, then decode entities (C&#43;&#43;, &amp;)
+        text = _HTML_TAG_RE.sub(' ', text)
+        if '&' in text:
+            text = html.unescape(text)
         # Replace common separators with spaces
-        text = re.sub(r'[/\-_]', ' ', text)
+        text = _SEPARATOR_RE.sub(' ', text)
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         return text.strip()
 
     def _normalize_skill(self, skill: str) -> str:
         """Normalize skill name for consistency."""
         skill = skill.lower().strip()
         # Handle common variations
-        if skill in self.aliases:
-            return self.aliases[skill]
+        skill = self.aliases.get(skill, skill)
         # Capitalize appropriately
         if '.' in skill:
             # Handle things like "node.js" -> "Node.js"
@@ -203,16 +241,20 @@ class SkillsExtractor:
             return ' '.join(word.capitalize() for word in skill.split())
 
     def extract_skills_with_categories(self, text: str) -> dict:
-        """Extract skills and categorize them."""
-        skills = self.extract_skills(text)
+        """Extract skills and categorize them, alphabetically within each category."""
+        return self.categorize_skills(self.extract_skills(text))
+
+    def categorize_skills(self, skills: List[str]) -> dict:
+        """Group extracted skill names by taxonomy category, sorted within each."""
         categorized = {category: [] for category in SKILLS_TAXONOMY.keys()}
+        category_by_skill = self._category_by_skill
 
-        for skill in skills:
-            skill_lower = skill.lower()
-            for category, category_skills in SKILLS_TAXONOMY.items():
-                if skill_lower in [s.lower() for s in category_skills]:
-                    categorized[category].append(skill)
-                    break
+        for skill in sorted(skills):
+            category = category_by_skill.get(skill)
+            if category is None:
+                category = SKILL_NAME_TO_CATEGORY.get(skill.lower())
+            if category is not None:
+                categorized[category].append(skill)
 
         # Remove empty categories
         return {k: v for k, v in categorized.items() if v}
@@ -230,19 +272,52 @@ def get_extractor() -> SkillsExtractor:
     return _extractor
 
 
+# Skills of recently seen texts, keyed by a digest of the normalized text:
+# aggregator feeds re-list the same posting many times, often with only
+# markup or whitespace changed, and a digest keeps the cache small however
+# long the descriptions are
+_SKILL_CACHE_SIZE = 8192
+_skill_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+_skill_cache_lock = threading.Lock()
+
+
 def extract_skills(text: str) -> List[str]:
     """Extract skill keywords from the given text.
 
-    This is the main function to be used by other modules.
+    This is the main function to be used by other modules. Results are
+    memoized per distinct normalized text (see SkillsExtractor.normalize_text)
+    and come in no particular order.
     """
+    if not text or text.isspace():
+        return []
+
     extractor = get_extractor()
-    return extractor.extract_skills(text)
+    text = extractor.normalize_text(text)
+    if not text:
+        # Nothing but markup and whitespace
+        return []
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _skill_cache_lock:
+        skills = _skill_cache.get(key)
+        if skills is not None:
+            _skill_cache.move_to_end(key)
+            return list(skills)
+
+    skills = tuple(extractor._match(text))
+    with _skill_cache_lock:
+        _skill_cache[key] = skills
+        if len(_skill_cache) > _SKILL_CACHE_SIZE:
+            _skill_cache.popitem(last=False)
+    return list(skills)
 
 
 def extract_skills_with_categories(text: str) -> dict:
-    """Extract skills and return them categorized."""
-    extractor = get_extractor()
-    return extractor.extract_skills_with_categories(text)
+    """Extract skills and return them categorized.
+
+    Shares extract_skills' cache, so categorizing a text already seen only
+    costs the grouping.
+    """
+    return get_extractor().categorize_skills(extract_skills(text))
 
 
 if __name__ == "__main__":
@@ -260,7 +335,7 @@ if __name__ == "__main__":
     """
 
     print("Extracted skills:")
-    skills = extract_skills(sample_job)
+    skills = sorted(extract_skills(sample_job))
     for skill in skills:
         print(f"  - {skill}")
 
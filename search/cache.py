@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from threading import RLock
+import hashlib
+import time
+from typing import Any, Hashable, Tuple, Union
+
+
+def text_digest(text: str) -> bytes:
+    """Return a compact key identifying ``text`` for memoization."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live.
+
+    ``ttl=None`` keeps entries until they are evicted by size.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: Union[float, None] = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key: Hashable) -> Union[Any, None]:
+        """Return the cached value for ``key`` or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        with self._lock:
+            expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,17 +1,32 @@
 from typing import List, Set
 
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
 from db.db_client import get_session
-from db.models import Job
+from db.models import Job, JobSkill, Skill
 
 
 def recommend_jobs(profile_skills: List[str], limit: int = 10) -> List[Job]:
-    """Return jobs matching any of the provided skills."""
-    wanted: Set[str] = {s.lower() for s in profile_skills}
+    """Return jobs matching any of the provided skills, most matches first.
+
+    Scored in the database: the wanted skills are looked up by name and their
+    job_skills postings (indexed on ``skill_id, job_id``) counted per job.
+    """
+    wanted: Set[str] = {s.lower() for s in profile_skills if s}
+    if not wanted:
+        return []
+
+    matches = func.count(JobSkill.skill_id)
+    stmt = (
+        select(Job)
+        .join(JobSkill, JobSkill.job_id == Job.id)
+        .join(Skill, Skill.id == JobSkill.skill_id)
+        .where(func.lower(Skill.name).in_(wanted))
+        .group_by(Job.id)
+        .order_by(matches.desc(), Job.posting_date.desc(), Job.id.desc())
+        .limit(limit)
+        .options(selectinload(Job.skills))
+    )
     with get_session() as session:
-        jobs = session.query(Job).all()
-    matches = [
-        job
-        for job in jobs
-        if wanted.intersection({s.lower() for s in (job.skills or [])})
-    ]
-    return matches[:limit]
+        return list(session.scalars(stmt))
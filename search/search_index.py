@@ -1,22 +1,58 @@
-from typing import List
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
-from sqlalchemy import or_, select
+from sqlalchemy import Select, bindparam, or_, select
+from sqlalchemy.orm import Session
 
-from db.db_client import get_session
+from db.db_client import FULL_TEXT_MATCH, FULL_TEXT_RANK, get_db_client, get_session
 from db.models import Job
 
 
-def search_jobs(query: str, limit: int = 10) -> List[Job]:
-    """Return jobs matching the query in title or description."""
-    with get_session() as session:
-        stmt = (
-            select(Job)
-            .where(
-                or_(
-                    Job.title.ilike(f"%{query}%"),
-                    Job.description.ilike(f"%{query}%"),
-                )
+def search_jobs(
+    query: str,
+    limit: int = 10,
+    session: Union[Session, None] = None,
+    columns: Union[Sequence[Any], None] = None,
+) -> List[Any]:
+    """Return jobs matching the query in title or description.
+
+    Uses the ``search_tsv`` full-text index when the migration has added it,
+    ranking the best matches first, and falls back to ILIKE otherwise.
+
+    Runs on ``session`` when one is given (e.g. a request-scoped session),
+    otherwise opens a session of its own. When ``columns`` (``Job``
+    attributes) is given, only those columns are selected and plain rows are returned instead of
+    ``Job`` instances.
+    """
+    fields = tuple(column.key for column in columns) if columns else ()
+    full_text = get_db_client().has_full_text_index()
+    stmt = _search_stmt(fields, full_text)
+    params = {"query": query, "limit": limit} if full_text else {"pattern": f"%{query}%", "limit": limit}
+    if session is None:
+        with get_session() as session:
+            return _fetch(session, stmt, params, columns)
+    return _fetch(session, stmt, params, columns)
+
+
+@lru_cache(maxsize=32)
+def _search_stmt(fields: Tuple[str, ...], full_text: bool) -> Select:
+    """Build the search statement once per shape; values are bound at execute time."""
+    stmt = select(*(getattr(Job, field) for field in fields)) if fields else select(Job)
+    if full_text:
+        # Match against the GIN-indexed tsvector added by db/migrate.py; a
+        # leading-wildcard ILIKE can't use an index and scans every job
+        stmt = stmt.where(FULL_TEXT_MATCH).order_by(FULL_TEXT_RANK)
+    else:
+        stmt = stmt.where(
+            or_(
+                Job.title.ilike(bindparam("pattern")),
+                Job.description.ilike(bindparam("pattern")),
             )
-            .limit(limit)
         )
-        return list(session.scalars(stmt))
+    return stmt.limit(bindparam("limit"))
+
+
+def _fetch(session: Session, stmt: Select, params: Dict[str, Any], columns) -> List[Any]:
+    if columns:
+        return list(session.execute(stmt, params).all())
+    return list(session.scalars(stmt, params))
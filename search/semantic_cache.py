@@ -0,0 +1,66 @@
+from threading import RLock
+import time
+from typing import Any, List, Sequence, Union
+
+import numpy as np
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+class SemanticCache:
+    """Cache keyed on query embeddings so near-duplicate queries share an entry.
+
+    Lookups return the payload of the most similar cached query when its cosine
+    similarity exceeds ``threshold``. Entries expire ``ttl`` seconds after they
+    are added and are evicted FIFO once ``maxsize`` queries have been stored.
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 10_000, ttl: float = 3600) -> None:
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._vectors: Union[np.ndarray, None] = None
+        self._expires_at = np.zeros(maxsize, dtype=np.float64)
+        self._payloads: List[Any] = [None] * maxsize
+        self._next = 0
+        self._size = 0
+        self._lock = RLock()
+
+    def get(self, vector: Sequence[float]) -> Union[Any, None]:
+        """Return the payload cached for the nearest query, or ``None`` on a miss."""
+        v = _unit(vector)
+        with self._lock:
+            if not self._size:
+                return None
+            scores = self._vectors[: self._size] @ v
+            scores[self._expires_at[: self._size] < time.monotonic()] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] > self.threshold:
+                return self._payloads[best]
+        return None
+
+    def add(self, vector: Sequence[float], payload: Any) -> None:
+        """Cache ``payload`` under the query embedding ``vector``."""
+        v = _unit(vector)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, v.shape[0]), dtype=np.float32)
+            self._vectors[self._next] = v
+            self._payloads[self._next] = payload
+            self._expires_at[self._next] = time.monotonic() + self.ttl
+            self._next = (self._next + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._payloads = [None] * self.maxsize
+            self._next = 0
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
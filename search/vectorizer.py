@@ -1,18 +1,58 @@
 from typing import List, Union
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from config import settings
+from search.cache import TTLCache, text_digest
+
 _model: Union[SentenceTransformer, None] = None
 
+# Recently embedded texts, keyed by digest so long descriptions aren't kept
+# in memory; repeated boilerplate descriptions skip the model
+_recent = TTLCache(maxsize=16_384, ttl=None)
+
 
 def get_model() -> SentenceTransformer:
+    """Return the shared model, loading it on first use.
+
+    Runs on ``settings.embedding_device`` (JOB_FINDER_EMBEDDING_DEVICE), or on
+    the GPU when one is available if that isn't set.
+    """
     global _model
     if _model is None:
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
+        device = settings.embedding_device
+        if device is None:
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        _model = SentenceTransformer("all-MiniLM-L6-v2", device=device)
     return _model
 
 
-def embed(text: str) -> List[float]:
-    """Return an embedding vector for the provided text."""
-    model = get_model()
-    return model.encode([text])[0].tolist()
+def embed(text: str) -> np.ndarray:
+    """Return an embedding vector (float32) for the provided text."""
+    return embed_batch([text])[0]
+
+
+def embed_batch(texts: List[str], batch_size: int = 128) -> List[np.ndarray]:
+    """Return embedding vectors for ``texts`` from batched model passes.
+
+    Texts embedded recently (or repeated within ``texts``) are encoded once.
+    Vectors are float32 numpy arrays, which pgvector columns accept as-is;
+    call ``.tolist()`` where plain floats are needed.
+    """
+    keys = [text_digest(text) for text in texts]
+    vectors = {key: _recent.get(key) for key in keys}
+    missing = {key: text for key, text in zip(keys, texts) if vectors[key] is None}
+    if missing:
+        encoded = get_model().encode(
+            list(missing.values()),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        for key, vector in zip(missing, encoded):
+            _recent.set(key, vector)
+            vectors[key] = vector
+    return [vectors[key] for key in keys]
@@ -2,7 +2,7 @@ import os
 import sys
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -10,16 +10,47 @@ from db import db_client
 from db.models import Base
 
 
-@pytest.fixture(autouse=True)
-def in_memory_db(monkeypatch):
-    engine = create_engine("sqlite:///:memory:", future=True)
-    TestingSessionLocal = sessionmaker(bind=engine)
-    Base.metadata.create_all(bind=engine)
+@pytest.fixture(scope="session")
+def test_client():
+    # One in-memory database (a StaticPool, so every checkout shares it) whose
+    # schema is created once for the whole run
+    client = db_client.DatabaseClient("sqlite://")
+
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINTs; let
+    # SQLAlchemy issue BEGIN so the per-test rollback below really undoes
+    # each test's writes
+    @event.listens_for(client.engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(client.engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
 
-    def get_session():
-        return TestingSessionLocal()
+    Base.metadata.create_all(bind=client.engine)
+    yield client
+    client.engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(monkeypatch, test_client):
+    # Run each test inside an outer transaction that is rolled back afterwards;
+    # sessions join it through savepoints, so their commits don't escape
+    connection = test_client.engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
 
-    monkeypatch.setattr(db_client, "engine", engine)
-    monkeypatch.setattr(db_client, "SessionLocal", TestingSessionLocal)
-    monkeypatch.setattr(db_client, "get_session", get_session)
+    monkeypatch.setattr(test_client, "SessionLocal", TestingSessionLocal)
+    # The schema already exists; keep init_db() inside the test transaction
+    # rather than opening a second one on the shared connection
+    monkeypatch.setattr(test_client, "init_db", lambda: Base.metadata.create_all(bind=connection))
+    # The embedding worker thread would share the test connection
+    monkeypatch.setattr(test_client, "embed_jobs_in_background", lambda job_ids: None)
+    monkeypatch.setattr(db_client, "_db_client", test_client)
     yield
+    transaction.rollback()
+    connection.close()
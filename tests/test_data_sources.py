@@ -1,7 +1,9 @@
 from types import SimpleNamespace
 
+import orjson
 import pytest
 
+from data_sources import _http
 from data_sources.adzuna_client import AdzunaClient
 from data_sources.ziprecruiter_client import ZipRecruiterClient
 from data_sources.usajobs_client import USAJobsClient
@@ -9,8 +11,9 @@ from data_sources.jobspikr_client import JobsPikrClient
 
 
 class DummyResponse(SimpleNamespace):
-    def json(self):
-        return self.data
+    @property
+    def content(self):
+        return orjson.dumps(self.data)
 
     def raise_for_status(self):
         pass
@@ -22,7 +25,7 @@ def test_adzuna_fetch(monkeypatch):
     def fake_get(url, params=None, timeout=0):
         return DummyResponse(data=sample)
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr(_http.get_session(), "get", fake_get)
     client = AdzunaClient(app_id="id", app_key="key")
     jobs = client.fetch_jobs()
     assert jobs == sample["results"]
@@ -34,7 +37,7 @@ def test_ziprecruiter_fetch(monkeypatch):
     def fake_get(url, params=None, timeout=0):
         return DummyResponse(data=sample)
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr(_http.get_session(), "get", fake_get)
     client = ZipRecruiterClient(api_key="key")
     jobs = client.fetch_jobs()
     assert jobs == sample["jobs"]
@@ -46,7 +49,7 @@ def test_usajobs_fetch(monkeypatch):
     def fake_get(url, headers=None, params=None, timeout=0):
         return DummyResponse(data=sample)
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr(_http.get_session(), "get", fake_get)
     client = USAJobsClient(api_key="key", user_agent="agent")
     jobs = client.fetch_jobs()
     assert jobs == sample["SearchResult"]["SearchResultItems"]
@@ -58,7 +61,7 @@ def test_jobspikr_fetch(monkeypatch):
     def fake_get(url, headers=None, params=None, timeout=0):
         return DummyResponse(data=sample)
 
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr(_http.get_session(), "get", fake_get)
     client = JobsPikrClient(api_key="key")
     jobs = client.fetch_jobs()
     assert jobs == sample["data"]
@@ -1,4 +1,6 @@
-from db.db_client import get_session, init_db
+from sqlalchemy import select
+
+from db.db_client import get_db_client, get_session, init_db
 from db.models import Job
 
 
@@ -9,3 +11,33 @@ def test_init_and_crud():
         session.add(job)
         session.commit()
         assert session.query(Job).count() == 1
+
+
+def test_batch_upsert_keeps_columns_a_row_omits():
+    client = get_db_client()
+    client.batch_upsert_jobs([
+        {"url": "http://a", "title": "A", "company": "X", "description": "keep me", "location": "NY"},
+    ])
+    inserted, updated = client.batch_upsert_jobs([
+        {"url": "http://a", "title": "A2", "company": "X"},
+        {"url": "http://b", "title": "B", "company": "Y", "description": "d", "location": "SF"},
+    ])
+    assert (inserted, updated) == (1, 1)
+
+    with get_session() as session:
+        job = session.scalars(select(Job).where(Job.url == "http://a")).one()
+        assert job.title == "A2"
+        assert job.description == "keep me"
+        assert job.location == "NY"
+
+
+def test_batch_upsert_inserts_every_job_without_url():
+    inserted, updated = get_db_client().batch_upsert_jobs([
+        {"url": "", "title": "A", "company": "X"},
+        {"url": "", "title": "B", "company": "Y"},
+    ])
+    assert (inserted, updated) == (2, 0)
+
+    with get_session() as session:
+        titles = session.scalars(select(Job.title).order_by(Job.title)).all()
+        assert titles == ["A", "B"]
@@ -1,4 +1,4 @@
-from parsers.normalize import normalize_job
+from parsers.normalize import deduplicate_jobs, normalize_job
 
 
 def test_normalize_adzuna():
@@ -49,3 +49,14 @@ def test_normalize_generic():
     assert job["company"] == "ACME"
     assert job["location"] == "LA"
     assert job["url"] == "link"
+
+
+def test_deduplicate_jobs_ignores_tracking_params_and_case():
+    jobs = [
+        {"title": "Dev", "company": "ACME", "url": "https://Jobs.example.com/1?id=7&utm_source=x"},
+        {"title": "Other", "company": "B", "url": "https://jobs.example.com/1/?id=7#apply"},
+        {"title": " dev ", "company": "acme", "url": "https://jobs.example.com/2"},
+        {"title": "Dev", "company": "ACME", "url": "https://jobs.example.com/1?id=8"},
+        {"title": "Dev", "company": "ACME", "location": "Boston", "url": "https://jobs.example.com/3"},
+    ]
+    assert deduplicate_jobs(jobs) == [jobs[0], jobs[4]]
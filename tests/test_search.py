@@ -1,15 +1,15 @@
-from db.db_client import get_session
-from db.models import Job
+from db.db_client import get_db_client
+from search.cache import TTLCache
 from search.search_index import search_jobs
+from search.semantic_cache import SemanticCache
 from search.recommend import recommend_jobs
 
 
 def setup_jobs():
-    with get_session() as session:
-        job1 = Job(title="Python Dev", company="A", description="Python role", skills=["python"])
-        job2 = Job(title="Java Dev", company="B", description="Java role", skills=["java"])
-        session.add_all([job1, job2])
-        session.commit()
+    get_db_client().batch_upsert_jobs([
+        {"title": "Python Dev", "company": "A", "description": "Python role", "skills": ["python"]},
+        {"title": "Java Dev", "company": "B", "description": "Java role", "skills": ["java"]},
+    ])
 
 
 def test_search_jobs():
@@ -24,3 +24,44 @@ def test_recommend_jobs():
     results = recommend_jobs(["java"])
     assert len(results) == 1
     assert results[0].company == "B"
+
+
+def test_ttl_cache_evicts_and_expires(monkeypatch):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    monkeypatch.setattr("search.cache.time.monotonic", lambda: float("inf"))
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_without_ttl_only_evicts_by_size():
+    cache = TTLCache(maxsize=1, ttl=None)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    cache.set("b", 2)
+    assert cache.get("a") is None
+
+
+def test_semantic_cache_matches_near_duplicates():
+    cache = SemanticCache(threshold=0.9, maxsize=2)
+    cache.add([1.0, 0.0], "python")
+    assert cache.get([0.99, 0.05]) == "python"
+    assert cache.get([0.0, 1.0]) is None
+
+    cache.add([0.0, 1.0], "java")
+    cache.add([0.7, 0.7], "mixed")
+    assert cache.get([1.0, 0.0]) is None
+
+
+def test_semantic_cache_expires(monkeypatch):
+    cache = SemanticCache(threshold=0.9, ttl=10)
+    cache.add([1.0, 0.0], "python")
+    assert cache.get([1.0, 0.0]) == "python"
+
+    monkeypatch.setattr("search.semantic_cache.time.monotonic", lambda: float("inf"))
+    assert cache.get([1.0, 0.0]) is None
@@ -79,6 +79,16 @@ def test_empty_input():
     """Test that empty input returns empty list."""
     assert extract_skills("") == []
     assert extract_skills(None) == []
+    assert extract_skills("   ") == []
+    assert extract_skills("<br/> <p></p>") == []
+
+
+def test_repeated_text_returns_independent_lists():
+    """Test that cached results are not shared between callers."""
+    text = "Backend role using Python and PostgreSQL"
+    first = extract_skills(text)
+    first.append("Cobol")
+    assert extract_skills(text) == first[:-1]
 
 
 def test_no_skills_in_text():
@@ -135,6 +145,14 @@ def test_html_tag_removal():
     assert "Javascript" in skills
 
 
+def test_html_entities_decoded():
+    """Test that HTML entities are decoded before extraction."""
+    skills = extract_skills("<li>C&#43;&#43; &amp; Rust</li>")
+
+    assert "C++" in skills
+    assert "Rust" in skills
+
+
 def test_special_characters_handling():
     """Test handling of skills with special characters."""
     text = "C++, C#, F#, ASP.NET, Node.js experience required"